@@ -11,7 +11,7 @@ SMB3-style single-file Pygame engine (5 worlds × 3 levels, Boom-style bosses).
   P-meter that fills while sprinting. When full, you get a short "glide"
   (slow fall) to mimic a simplified tail-flight feel—purely original code.
 How to run locally (requires a desktop with a display):
-    pip install pygame
+    pip install pygame numpy
     python program.py
 Controls (Overworld):
     Arrow keys / WASD – move cursor between unlocked nodes
@@ -28,11 +28,15 @@ Notes & Legal:
   assets are included. All graphics are procedurally generated, inspired by public descriptions of SMB3 sprites.
 - Pure Python + Pygame implementation.
 """
+import copy
+import functools
 import math
 import random
 import sys
+import time
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+import numpy as np
 import pygame
 # -----------------------------------------------------------------------------
 # CONFIG
@@ -40,6 +44,8 @@ import pygame
 WIDTH, HEIGHT = 960, 540
 TILE = 32
 FPS = 60
+SOLID_CELL = TILE * 4   # spatial-hash cell size for level solids
+CULL_MARGIN = 64        # px beyond the screen edges that still counts as on-screen
 # Physics tuned toward "SMB3-ish" feel (not a byte-perfect clone)
 GRAVITY = 0.60
 JUMP_VEL = -11.6
@@ -77,37 +83,61 @@ PURPLE = (142, 84, 233)
 BEIGE = (248, 216, 120) # SMB3 title screen background color
 SKIN = (255, 204, 153) # Approximate Mario skin tone
 BROWN = (139, 69, 19) # For Goomba, etc.
+COLORKEY = (255, 0, 255) # Transparent colour of keyed sprite surfaces (never drawn)
 # Game states
 STATE_TITLE = "title"
 STATE_OVERWORLD = "overworld"
 STATE_LEVEL = "level"
 STATE_BOSS = "boss"
 STATE_ENDING = "ending"
+# The only event types any scene reacts to; everything else is blocked at the SDL queue
+WATCHED_EVENTS = [pygame.QUIT, pygame.KEYDOWN]
 # -----------------------------------------------------------------------------
 # SMALL UTILS
 # -----------------------------------------------------------------------------
 def clamp(v, lo, hi):
     return max(lo, min(hi, v))
-def rect_from_tile(x, y):
-    return pygame.Rect(x*TILE, y*TILE, TILE, TILE)
-def text(surface, font, msg, pos, color=BLACK, center=False, shadow=True):
+def keyed_surface(size):
+    """Display-format Surface cleared to COLORKEY (transparent); cheaper to blit than SRCALPHA for hard-edged art."""
+    surf = pygame.Surface(size).convert()
+    surf.fill(COLORKEY)
+    surf.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return surf
+_TEXT_CACHE = {}
+TEXT_CACHE_MAX = 256
+def render_cached(font, msg, color):
+    """font.render() memoized on (font, msg, color); evicts the least recently used entry past TEXT_CACHE_MAX."""
+    key = (id(font), msg, color)
+    img = _TEXT_CACHE.pop(key, None)
+    if img is None:
+        img = font.render(msg, True, color).convert_alpha()
+        if len(_TEXT_CACHE) >= TEXT_CACHE_MAX:
+            del _TEXT_CACHE[next(iter(_TEXT_CACHE))]
+    _TEXT_CACHE[key] = img  # (re)inserted last, so the dict runs least to most recently used
+    return img
+def text_blits(font, msg, pos, color=BLACK, center=False, shadow=True):
+    """(Surface, dest) pairs that draw msg like text(); keep the list to re-blit static labels."""
+    out = []
     if shadow:
-        s = font.render(msg, True, (0,0,0))
+        s = render_cached(font, msg, (0,0,0))
         sp = (pos[0]+1, pos[1]+1)
         if center:
             sr = s.get_rect(center=pos)
             sp = (sr.x+1, sr.y+1)
-        surface.blit(s, sp)
-    img = font.render(msg, True, color)
+        out.append((s, sp))
+    img = render_cached(font, msg, color)
     if center:
-        r = img.get_rect(center=pos)
-        surface.blit(img, r)
+        out.append((img, img.get_rect(center=pos)))
     else:
-        surface.blit(img, pos)
+        out.append((img, pos))
+    return out
+def text(surface, font, msg, pos, color=BLACK, center=False, shadow=True):
+    surface.blits(text_blits(font, msg, pos, color, center, shadow), doreturn=False)
 # -----------------------------------------------------------------------------
 # CORE ENTITIES
 # -----------------------------------------------------------------------------
 class Player:
+    _glow = None  # P-meter glow sprite, built on first draw (needs the display format)
     def __init__(self, x, y):
         self.rect = pygame.Rect(x, y, 16, 32)  # SMB3-like size for big Mario
         self.vx = 0.0
@@ -123,13 +153,12 @@ class Player:
         self.glide_left = 0
         self.jump_held = False
     # -------------------------- Input & Physics -----------------------------
-    def input_move(self, keys):
+    def input_move(self, left, right, running):
         move = 0
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if left:
             move -= 1
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if right:
             move += 1
-        running = (keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT])
         target_speed = MAX_RUN if running else MAX_WALK
         # Facing & skid
         if move != 0:
@@ -153,8 +182,7 @@ class Player:
             self.pmeter = min(PMETER_MAX, self.pmeter + PMETER_GAIN_SPEED)
         else:
             self.pmeter = max(0.0, self.pmeter - PMETER_DECAY_SPEED)
-    def input_jump(self, keys):
-        pressed = (keys[pygame.K_z] or keys[pygame.K_k] or keys[pygame.K_SPACE])
+    def input_jump(self, pressed):
         if pressed and not self.jump_held and self.on_ground:
             self.vy = JUMP_VEL
             self.on_ground = False
@@ -172,15 +200,12 @@ class Player:
             self.glide_left -= 1
         else:
             self.vy += GRAVITY
-        self.vy = clamp(self.vy, -50, 20)
+        # inlined clamp(vy, -50, 20): runs for the player every frame
+        vy = self.vy
+        self.vy = -50 if vy < -50 else (20 if vy > 20 else vy)
     def collides(self, rects: List[pygame.Rect]) -> List[pygame.Rect]:
-        hits = []
-        pr = self.rect
-        for r in rects:
-            # Quick AABB test
-            if pr.right > r.left and pr.left < r.right and pr.bottom > r.top and pr.top < r.bottom:
-                hits.append(r)
-        return hits
+        # AABB test done in C by pygame
+        return [rects[i] for i in self.rect.collidelistall(rects)]
     def move_and_collide(self, solids: List[pygame.Rect]):
         # Horizontal
         self.rect.x += int(round(self.vx))
@@ -221,9 +246,11 @@ class Player:
         self.glide_left = 0
         self.jump_held = False
     # ------------------------------ Update ----------------------------------
-    def update(self, keys, solids, hazards, enemies, projectiles):
-        self.input_move(keys)
-        self.input_jump(keys)
+    def update(self, inputs, solids, hazards, enemies, projectiles):
+        # inputs: (left, right, run, jump) booleans sampled once per frame
+        left, right, run, jump = inputs
+        self.input_move(left, right, run)
+        self.input_jump(jump)
         self.apply_gravity()
         self.move_and_collide(solids)
         # Hazards (instant respawn)
@@ -270,8 +297,11 @@ class Player:
         pygame.draw.rect(surface, BROWN if flash_color is None else flash_color, (r.x+2, r.bottom-4, r.width-4, 4))
         # P-meter glow effect when full
         if self.pmeter >= PMETER_MAX - 1e-6:
-            glow = pygame.Surface((r.width+8, r.height+8), pygame.SRCALPHA)
-            pygame.draw.ellipse(glow, (255, 255, 100, 60), glow.get_rect())
+            glow = Player._glow
+            if glow is None:
+                glow = pygame.Surface((r.width+8, r.height+8), pygame.SRCALPHA).convert_alpha()
+                pygame.draw.ellipse(glow, (255, 255, 100, 60), glow.get_rect())
+                Player._glow = glow
             surface.blit(glow, (r.x-4, r.y-4), special_flags=pygame.BLEND_ALPHA_SDL2)
 class Projectile:
     def __init__(self, x, y, vx, vy, radius=6, color=PURPLE):
@@ -284,10 +314,8 @@ class Projectile:
             return
         self.rect.x += int(round(self.vx))
         self.rect.y += int(round(self.vy))
-        for s in solids:
-            if self.rect.colliderect(s):
-                self.alive = False
-                break
+        if self.rect.collidelist(solids) != -1:
+            self.alive = False
     def draw(self, surface, camera_x):
         if not self.alive: return
         pygame.draw.ellipse(surface, self.color, self.rect.move(-camera_x, 0))
@@ -296,42 +324,15 @@ class Projectile:
 # -----------------------------------------------------------------------------
 class Walker:
     """Simple goomba-like walker that flips at edges/walls."""
+    SIZE = 16  # SMB3 Goomba size
     def __init__(self, x, y, dir=1):
-        self.rect = pygame.Rect(x, y, 16, 16)  # SMB3 Goomba size
+        self.rect = pygame.Rect(x, y, Walker.SIZE, Walker.SIZE)
         self.vx = 1.2 * dir
         self.alive = True
         self.squash_timer = 0
     def stomped(self):
         self.squash_timer = 20
         self.alive = False
-    def update(self, solids: List[pygame.Rect]):
-        if not self.alive:
-            return
-        # Move & collide
-        self.rect.x += int(round(self.vx))
-        blocked = False
-        for s in solids:
-            if self.rect.colliderect(s):
-                blocked = True
-                if self.vx > 0:
-                    self.rect.right = s.left
-                else:
-                    self.rect.left = s.right
-                break
-        if blocked:
-            self.vx = -self.vx
-        # Edge check: if tile below ahead is empty, flip
-        ahead = self.rect.move(int(8 * (1 if self.vx > 0 else -1)), 1)
-        has_floor = False
-        # Downward probe
-        probe = self.rect.move(int(10 * (1 if self.vx > 0 else -1)), 1)
-        probe.height = TILE*2
-        for s in solids:
-            if s.collidepoint(probe.midbottom):
-                has_floor = True
-                break
-        if not has_floor:
-            self.vx = -self.vx
     def draw(self, surface, camera_x):
         r = self.rect.move(-camera_x, 0)
         if not self.alive:
@@ -351,56 +352,86 @@ class Walker:
         pygame.draw.circle(surface, BLACK, (r.centerx+4, r.y+6), 1)
         # Frown
         pygame.draw.arc(surface, BLACK, (r.x+4, r.y+10, r.width-8, 4), math.pi, 2*math.pi, 2)
+def step_walkers(walkers: List[Walker], mask: List[List[bool]]):
+    """Advance each walker one tick against the level's solid tile mask (mask[row][col])."""
+    rows = len(mask)
+    cols = len(mask[0]) if rows else 0
+    size = Walker.SIZE
+    for e in walkers:
+        r = e.rect
+        vx = e.vx
+        # Move & collide against the leading tile column (a walker spans at most two tile rows)
+        x = r.x + int(round(vx))
+        y = r.y
+        wx = (x + size - 1)//TILE if vx > 0 else x//TILE
+        if 0 <= wx < cols:
+            y0, y1 = y//TILE, (y + size - 1)//TILE
+            if (0 <= y0 < rows and mask[y0][wx]) or (0 <= y1 < rows and mask[y1][wx]):
+                x = wx*TILE - size if vx > 0 else (wx + 1)*TILE
+                vx = -vx
+        # Edge check: if tile below ahead is empty, flip (probe point two tiles down)
+        tx = (x + size//2 + (10 if vx > 0 else -10))//TILE
+        ty = (y + 1 + TILE*2)//TILE
+        if not (0 <= tx < cols and 0 <= ty < rows and mask[ty][tx]):
+            vx = -vx
+        r.x = x
+        e.vx = vx
 # -----------------------------------------------------------------------------
 # BOSSES
 # -----------------------------------------------------------------------------
 class BoomStyleBoss:
     """Small arena boss: patrol + hop, vulnerable to stomps, 3+ hits based on world."""
+    _half_w = 18
+    _half_h = 24
     def __init__(self, arena_rect: pygame.Rect, difficulty: int):
         base_hits = 3
         self.max_hp = base_hits + difficulty # scale across worlds
         self.hp = self.max_hp
         self.arena = arena_rect
-        self.pos = pygame.Vector2(arena_rect.centerx, arena_rect.bottom - 40)
-        self.vel = pygame.Vector2(2.0 + difficulty*0.3, 0.0)
+        # Plain float position/velocity (centre of the body)
+        self.px, self.py = float(arena_rect.centerx), float(arena_rect.bottom - 40)
+        self.vx, self.vy = 2.0 + difficulty*0.3, 0.0
         self.timer = 0
         self.state = "patrol"
         self.alive = True
         self.hurt_timer = 0
     def rect(self) -> pygame.Rect:
-        return pygame.Rect(int(self.pos.x)-18, int(self.pos.y)-24, 36, 48)
+        return pygame.Rect(int(self.px)-self._half_w, int(self.py)-self._half_h, self._half_w*2, self._half_h*2)
     def stomped(self):
         if not self.alive: return
         self.hp -= 1
         self.hurt_timer = 20
-        self.vel.y = JUMP_VEL * 0.6
+        self.vy = JUMP_VEL * 0.6
         if self.hp <= 0:
             self.alive = False
     def update(self, player: Player, solids: List[pygame.Rect], projectiles: List[Projectile]):
         if not self.alive: return
+        hw, hh = self._half_w, self._half_h
+        arena = self.arena
         self.timer += 1
         # simple hop every so often
-        if self.timer % 90 == 0 and self.rect().bottom >= self.arena.bottom - 2:
-            self.vel.y = JUMP_VEL * 0.9
+        if self.timer % 90 == 0 and int(self.py) + hh >= arena.bottom - 2:
+            self.vy = JUMP_VEL * 0.9
         # gravity
-        self.vel.y += GRAVITY
+        self.vy += GRAVITY
         # horizontal patrol
-        self.pos.x += self.vel.x
-        self.pos.y += self.vel.y
+        self.px += self.vx
+        self.py += self.vy
         # Clamp to arena and bounce on walls/floor
-        r = self.rect()
-        if r.left <= self.arena.left or r.right >= self.arena.right:
-            self.vel.x = -self.vel.x
-            self.pos.x = clamp(self.pos.x, self.arena.left+18, self.arena.right-18)
-        if r.bottom >= self.arena.bottom:
-            self.pos.y = self.arena.bottom - 24
-            self.vel.y = 0
+        left = int(self.px) - hw
+        if left <= arena.left or left + hw*2 >= arena.right:
+            self.vx = -self.vx
+            lo, hi = arena.left+hw, arena.right-hw
+            self.px = lo if self.px < lo else (hi if self.px > hi else self.px)
+        if int(self.py) + hh >= arena.bottom:
+            self.py = arena.bottom - hh
+            self.vy = 0.0
         # Throw an occasional projectile to keep you moving
         if self.timer % 70 == 0:
-            direction = 1 if (player.rect.centerx > self.pos.x) else -1
+            direction = 1 if (player.rect.centerx > self.px) else -1
             vx = direction * random.uniform(2.5, 3.5)
             vy = random.uniform(-3.0, -2.0)
-            projectiles.append(Projectile(self.pos.x, self.pos.y - 18, vx, vy, radius=6, color=ORANGE))
+            projectiles.append(Projectile(self.px, self.py - 18, vx, vy, radius=6, color=ORANGE))
         # Stomp window
         pr = player.rect
         br = self.rect()
@@ -436,8 +467,10 @@ class BoomStyleBoss:
 # -----------------------------------------------------------------------------
 @dataclass
 class Level:
-    raw: List[str]
-    solids: List[pygame.Rect]
+    _bg_cache = {}  # theme -> pre-rendered parallax strip, shared by all levels (built on first draw)
+    raw: Tuple[str, ...]
+    solids: List[pygame.Rect]  # collision rects, coalesced runs of solid tiles
+    tiles: List[List[pygame.Rect]]  # one rect per solid tile, bucketed by column, for drawing
     hazards: List[pygame.Rect]
     enemies: List[Walker]
     goal: Optional[pygame.Rect]
@@ -445,65 +478,128 @@ class Level:
     width: int
     height: int
     arena_rect: Optional[pygame.Rect]
+    solid_mask: List[List[bool]]  # [row][col], True where a tile is solid
+    solid_grid: Dict[Tuple[int,int], List[int]]  # SOLID_CELL cell -> indices into solids
     @staticmethod
-    def from_raw(raw_map: List[str]) -> "Level":
-        solids: List[pygame.Rect] = []
-        hazards: List[pygame.Rect] = []
-        enemies: List[Walker] = []
-        goal = None
+    def from_raw(raw_map: Tuple[str, ...]) -> "Level":
         spawn = (64, 64)
         arena_rect = None
         h = len(raw_map)
         w = len(raw_map[0]) if h > 0 else 0
-        for y, line in enumerate(raw_map):
-            for x, ch in enumerate(line):
-                if ch in ("X", "#", "-"):
-                    solids.append(rect_from_tile(x, y))
-                elif ch == "^":
-                    hazards.append(rect_from_tile(x, y))
-                elif ch == "G":
-                    goal = rect_from_tile(x, y)
-                elif ch == "P":
-                    spawn = (x*TILE, y*TILE-2)
-                elif ch == "b":
-                    # enemy walker
-                    enemies.append(Walker(x*TILE+5, y*TILE+10, dir=random.choice([-1,1])))
-                elif ch == "B":
-                    # boss arena marker row (center line); create rectangle once
-                    if not arena_rect:
-                        arena_rect = pygame.Rect(x*TILE-32, y*TILE-8, 20*TILE, 12*TILE)
+        # Parse the map once into a (rows, cols) uint8 array and pull each tile class out in bulk
+        grid = np.frombuffer("".join(raw_map).encode("ascii"), dtype=np.uint8).reshape(h, w)
+        solid_mask = np.isin(grid, (ord("X"), ord("#"), ord("-")))
+        T = TILE
+        def cells(mask):
+            ys, xs = np.nonzero(mask)
+            return zip(ys.tolist(), xs.tolist())
+        tiles: List[List[pygame.Rect]] = [[] for _ in range(w)]
+        for y, x in cells(solid_mask):
+            tiles[x].append(pygame.Rect(x*T, y*T, T, T))
+        hazards: List[pygame.Rect] = [pygame.Rect(x*T, y*T, T, T) for y, x in cells(grid == ord("^"))]
+        goal = None
+        for y, x in cells(grid == ord("G")):
+            goal = pygame.Rect(x*T, y*T, T, T)
+        for y, x in cells(grid == ord("P")):
+            spawn = (x*T, y*T-2)
+        # enemy walker templates; start_level sets each copy's facing
+        enemies: List[Walker] = [Walker(x*T+5, y*T+10) for y, x in cells(grid == ord("b"))]
+        # boss arena marker row (center line); the first marker places the arena
+        for y, x in cells(grid == ord("B")):
+            arena_rect = pygame.Rect(x*T-32, y*T-8, 20*T, 12*T)
+            break
+        # Collision rects: one per horizontal run of solid tiles, runs with the
+        # same span on consecutive rows are stacked into a single taller rect
+        solids: List[pygame.Rect] = []
+        open_runs = {}
+        edges = np.diff(np.pad(solid_mask.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+        for y in range(h):
+            starts = np.flatnonzero(edges[y] == 1).tolist()
+            ends = np.flatnonzero(edges[y] == -1).tolist()
+            for x0, x1 in zip(starts, ends):
+                r = open_runs.get((x0, x1))
+                if r is not None and r.bottom == y*T:
+                    r.height += T
+                else:
+                    r = pygame.Rect(x0*T, y*T, (x1-x0)*T, T)
+                    open_runs[(x0, x1)] = r
+                    solids.append(r)
+        # Static spatial hash so movers only test the solids in the cells they touch
+        solid_grid: Dict[Tuple[int,int], List[int]] = {}
+        c = SOLID_CELL
+        for i, r in enumerate(solids):
+            for cy in range(r.top//c, (r.bottom-1)//c + 1):
+                for cx in range(r.left//c, (r.right-1)//c + 1):
+                    solid_grid.setdefault((cx, cy), []).append(i)
         return Level(
             raw=raw_map,
             solids=solids,
+            tiles=tiles,
             hazards=hazards,
             enemies=enemies,
             goal=goal,
             spawn=spawn,
             width=w*TILE,
             height=h*TILE,
-            arena_rect=arena_rect
+            arena_rect=arena_rect,
+            solid_mask=solid_mask.tolist(),
+            solid_grid=solid_grid
         )
-    def draw_bg(self, surface, camera_x, theme=0):
-        surface.fill(SKY if theme == 0 else (186, 214, 255))
+    def solids_near(self, rect: pygame.Rect) -> List[pygame.Rect]:
+        """Solids sharing a spatial-hash cell with rect, in level order."""
+        c = SOLID_CELL
+        grid = self.solid_grid
+        found = set()
+        for cy in range(rect.top//c, (rect.bottom-1)//c + 1):
+            for cx in range(rect.left//c, (rect.right-1)//c + 1):
+                cell = grid.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        solids = self.solids
+        return [solids[i] for i in sorted(found)]
+    @staticmethod
+    def _make_bg(theme):
+        # One period of the parallax backdrop; shapes crossing the seam are drawn
+        # on both sides so the strip tiles seamlessly
+        period = WIDTH + 300
+        strip = pygame.Surface((period, HEIGHT)).convert()
+        strip.fill(SKY if theme == 0 else (186, 214, 255))
         # distant clouds / hills
         for i in range(7):
-            base_x = (i*220 - camera_x*0.2) % (WIDTH+300) - 150
             h = 100 + (i%3)*30
-            pygame.draw.ellipse(surface, (190, 238, 255), (base_x, 40+(i%2)*10, 180, 60), 0)
-            pygame.draw.ellipse(surface, (120, 200, 120), (base_x, HEIGHT-60-h, 240, h*2), 0)
-        pygame.draw.rect(surface, (95, 180, 100), (0, HEIGHT-60, WIDTH, 60))
-        pygame.draw.rect(surface, (75, 150, 85), (0, HEIGHT-48, WIDTH, 12))
+            for base_x in ((i*220) % period - 150 + k*period for k in (-1, 0, 1)):
+                pygame.draw.ellipse(strip, (190, 238, 255), (base_x, 40+(i%2)*10, 180, 60), 0)
+                pygame.draw.ellipse(strip, (120, 200, 120), (base_x, HEIGHT-60-h, 240, h*2), 0)
+        pygame.draw.rect(strip, (95, 180, 100), (0, HEIGHT-60, period, 60))
+        pygame.draw.rect(strip, (75, 150, 85), (0, HEIGHT-48, period, 12))
+        return strip
+    def draw_bg(self, surface, camera_x, theme=0):
+        strip = Level._bg_cache.get(theme)
+        if strip is None:
+            strip = Level._bg_cache[theme] = Level._make_bg(theme)
+        # Backdrop scrolls at 0.2x the camera; wrap around the strip with a second blit
+        period = strip.get_width()
+        src_x = int(camera_x*0.2) % period
+        surface.blit(strip, (0, 0), (src_x, 0, WIDTH, HEIGHT))
+        if period - src_x < WIDTH:
+            surface.blit(strip, (period - src_x, 0), (0, 0, WIDTH - (period - src_x), HEIGHT))
     def draw_tiles(self, surface, camera_x):
-        for r in self.solids:
-            rr = r.move(-camera_x, 0)
-            # Procedural ground tile inspired by SMB3 grass block
-            pygame.draw.rect(surface, DIRT, rr)
-            pygame.draw.rect(surface, ROCK, rr, 2)
-            # Add grass top if top row
-            pygame.draw.rect(surface, GRASS, (rr.x, rr.y, rr.width, 4))  # Grass layer
-            pygame.draw.line(surface, BLACK, (rr.x, rr.y+4), (rr.right, rr.y+4), 1)  # Edge
+        # Only the tile columns under the camera (plus the one whose edge line ends at x=0)
+        col0 = max(0, (int(camera_x)-1)//TILE)
+        col1 = min(len(self.tiles), col0 + WIDTH//TILE + 2)
+        for col in self.tiles[col0:col1]:
+            for r in col:
+                rr = r.move(-camera_x, 0)
+                # Procedural ground tile inspired by SMB3 grass block
+                pygame.draw.rect(surface, DIRT, rr)
+                pygame.draw.rect(surface, ROCK, rr, 2)
+                # Add grass top if top row
+                pygame.draw.rect(surface, GRASS, (rr.x, rr.y, rr.width, 4))  # Grass layer
+                pygame.draw.line(surface, BLACK, (rr.x, rr.y+4), (rr.right, rr.y+4), 1)  # Edge
         for r in self.hazards:
             rr = r.move(-camera_x, 0)
+            if rr.right < 0 or rr.left > WIDTH:
+                continue
             # Procedural spike inspired by SMB3
             pygame.draw.polygon(surface, RED, [(rr.left, rr.bottom), (rr.centerx, rr.top), (rr.right, rr.bottom)])
             pygame.draw.line(surface, BLACK, (rr.left, rr.bottom), (rr.centerx, rr.top), 1)
@@ -552,6 +648,21 @@ class OverworldMap:
                 if i > 0:
                     self.paths.append((idx-1, idx))
                 idx += 1
+        # Bake the static backdrop (sky, sea, islands, paths) once; draw() just blits it
+        self._bg = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._bg.fill(SKY)
+        pygame.draw.rect(self._bg, SEA, (0, HEIGHT-160, WIDTH, 160))
+        # islands
+        for i in range(5):
+            cx = 100 + i* (WIDTH-200)//4
+            pygame.draw.ellipse(self._bg, (232, 211, 163), (cx-120, HEIGHT-120, 240, 120))
+            pygame.draw.ellipse(self._bg, GRASS, (cx-110, HEIGHT-130, 220, 100))
+        # paths
+        for a, b in self.paths:
+            pa = self.nodes[a].pos
+            pb = self.nodes[b].pos
+            pygame.draw.line(self._bg, (210, 210, 210), pa, pb, 4)
+            pygame.draw.line(self._bg, WHITE, (pa[0], pa[1]-1), (pb[0], pb[1]-1), 2)
     def unlock_path_after_clear(self, world, index):
         # Unlock next node in world, else first node of next world
         for i, n in enumerate(self.nodes):
@@ -583,21 +694,9 @@ class OverworldMap:
                 best = i
         if best is not None:
             self.cursor = best
-    def draw(self, surface, font, progress_text):
-        # sky + ocean
-        surface.fill(SKY)
-        pygame.draw.rect(surface, SEA, (0, HEIGHT-160, WIDTH, 160))
-        # islands
-        for i in range(5):
-            cx = 100 + i* (WIDTH-200)//4
-            pygame.draw.ellipse(surface, (232, 211, 163), (cx-120, HEIGHT-120, 240, 120))
-            pygame.draw.ellipse(surface, GRASS, (cx-110, HEIGHT-130, 220, 100))
-        # paths
-        for a, b in self.paths:
-            pa = self.nodes[a].pos
-            pb = self.nodes[b].pos
-            pygame.draw.line(surface, (210, 210, 210), pa, pb, 4)
-            pygame.draw.line(surface, WHITE, (pa[0], pa[1]-1), (pb[0], pb[1]-1), 2)
+    def draw(self, surface, font, progress_blits):
+        # sky + ocean + islands + paths (pre-rendered in _build)
+        surface.blit(self._bg, (0, 0))
         # nodes (procedural level icons inspired by SMB3 map)
         for i, n in enumerate(self.nodes):
             c = (230,230,230) if n.unlocked else (150,150,150)
@@ -607,18 +706,25 @@ class OverworldMap:
             # Add small castle icon for boss nodes
             if n.index == self.worlds_levels[n.world]-1:
                 pygame.draw.rect(surface, RED, (n.pos[0]-6, n.pos[1]-8, 12, 8))  # Tower
-                pygame.draw.triangle(surface, RED, (n.pos[0]-6, n.pos[1]-8), (n.pos[0]+6, n.pos[1]-8), (n.pos[0], n.pos[1]-14))
+                pygame.draw.polygon(surface, RED, [(n.pos[0]-6, n.pos[1]-8), (n.pos[0]+6, n.pos[1]-8), (n.pos[0], n.pos[1]-14)])
         # cursor ring
         cur = self.nodes[self.cursor]
         pygame.draw.circle(surface, ORANGE, cur.pos, 16, 3)
         label = f"World {cur.world+1} - Stage {cur.index+1}"
         text(surface, font, label, (WIDTH//2, 40), BLACK, center=True)
-        text(surface, font, progress_text, (WIDTH//2, 70), BLACK, center=True)
+        surface.blits(progress_blits, doreturn=False)
 # -----------------------------------------------------------------------------
 # MAP TEMPLATES
 # -----------------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
 def make_basic_level(width_tiles=70, height_tiles=18, seed=0):
-    random.seed(seed)
+    # Draw every random number the layout needs up front from one seeded generator
+    rng = np.random.default_rng(seed)
+    plat_x = rng.integers(4, width_tiles-8, size=28, endpoint=True).tolist()
+    plat_y = rng.integers(5, height_tiles-7, size=28, endpoint=True).tolist()
+    plat_len = rng.integers(3, 8, size=28, endpoint=True).tolist()
+    walker_x = rng.integers(10, width_tiles-10, size=8, endpoint=True).tolist()
+    hazard_x = rng.integers(8, width_tiles-8, size=10, endpoint=True).tolist()
     rows = []
     for y in range(height_tiles):
         line = []
@@ -629,25 +735,21 @@ def make_basic_level(width_tiles=70, height_tiles=18, seed=0):
             line.append(ch)
         rows.append(line)
     # Scatter low & mid platforms
-    for _ in range(28):
-        px = random.randint(4, width_tiles-8)
-        py = random.randint(5, height_tiles-7)
-        ln = random.randint(3, 8)
+    for px, py, ln in zip(plat_x, plat_y, plat_len):
         for i in range(ln):
             rows[py][clamp(px+i, 0, width_tiles-1)] = "X"
     # Walkers
-    for _ in range(8):
-        x = random.randint(10, width_tiles-10)
+    for x in walker_x:
         y = height_tiles-3
         rows[y][x] = "b"
     # Hazards on ground
-    for _ in range(10):
-        x = random.randint(8, width_tiles-8)
+    for x in hazard_x:
         rows[height_tiles-2][x] = "^"
     # start + goal
     rows[height_tiles-4][2] = "P"
     rows[height_tiles-3][width_tiles-3] = "G"
-    return ["".join(r) for r in rows]
+    return tuple("".join(r) for r in rows)  # cached and shared, so immutable
+@functools.lru_cache(maxsize=None)
 def make_boss_level(width_tiles=52, height_tiles=18):
     rows = []
     for y in range(height_tiles):
@@ -668,7 +770,7 @@ def make_boss_level(width_tiles=52, height_tiles=18):
     rows[height_tiles-4][4] = "P"
     for x in range(12, width_tiles-12, 10):
         rows[height_tiles-2][x] = "^"
-    return ["".join(r) for r in rows]
+    return tuple("".join(r) for r in rows)  # cached and shared, so immutable
 # -----------------------------------------------------------------------------
 # GAME
 # -----------------------------------------------------------------------------
@@ -676,8 +778,9 @@ class Game:
     def __init__(self):
         pygame.init()
         pygame.display.set_caption("SMB3-Style Engine (Single File) - No Assets")
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.clock = pygame.time.Clock()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(WATCHED_EVENTS)
         self.font = pygame.font.SysFont("arial", 18, bold=True)
         self.big = pygame.font.SysFont("arial", 40, bold=True)
         self.state = STATE_TITLE
@@ -687,6 +790,8 @@ class Game:
         self.world_stage_counts = [3,3,3,3,3]
         self.overworld = OverworldMap(self.world_stage_counts)
         self.progress_clears = [[False]*c for c in self.world_stage_counts]
+        self._cleared_count = 0  # number of True entries in progress_clears
+        self._progress_cache = (None, -1)  # (progress line blits, _cleared_count they show)
         self.total_stages = sum(self.world_stage_counts)
         # Runtime
         self.level: Optional[Level] = None
@@ -695,29 +800,105 @@ class Game:
         self.boss: Optional[BoomStyleBoss] = None
         self.projectiles: List[Projectile] = []
         self.camera_x = 0
+        self._cam_x_fp = 0  # camera x in 1/16 px fixed point; camera_x is its integer part
         # Title screen animation
         self.title_curtain_pos = 0 # For curtain opening animation
-        # Cache levels
+        self._title_shown_width = None  # curtain width last presented (None: nothing yet)
+        self._ending_shown = False
+        # Static title art, drawn once: checkered floor and the curtain scallop edges
+        tile_size = 32
+        floor_height = tile_size * 2
+        self._title_floor = pygame.Surface((WIDTH, floor_height)).convert()
+        for x in range(0, WIDTH, tile_size):
+            for y in range(0, floor_height, tile_size):
+                color = BLACK if ((x // tile_size) + (y // tile_size)) % 2 == 0 else WHITE
+                pygame.draw.rect(self._title_floor, color, (x, y, tile_size, tile_size))
+        # (2px side margins: the arc stroke spills one pixel past its 20px box)
+        self._scallop_left = keyed_surface((24, HEIGHT))
+        self._scallop_right = keyed_surface((24, HEIGHT))
+        for yy in range(0, HEIGHT, 20):
+            pygame.draw.arc(self._scallop_left, BLACK, (2, yy, 20, 20), math.pi, 2*math.pi, 2)
+            pygame.draw.arc(self._scallop_right, BLACK, (2, yy, 20, 20), 0, math.pi, 2)
+        # Static strings, rendered once into (Surface, dest) blit lists
+        self._title_blits = (
+            text_blits(self.big, "Samsoft Ultra Simulator — SMB3-Style Engine", (WIDTH//2, HEIGHT//2-60), BLACK, center=True)
+            + text_blits(self.font, "Node-map overworld • 5 Worlds × 3 Stages • Boom-style Boss each world", (WIDTH//2, HEIGHT//2-18), BLACK, center=True)
+            + text_blits(self.font, "Press Enter to start • Esc to quit", (WIDTH//2, HEIGHT//2+26), BLACK, center=True))
+        self._ending_blits = (
+            text_blits(self.big, "Thank you for playing!", (WIDTH//2, HEIGHT//2-40), BLACK, center=True)
+            + text_blits(self.font, "All 5 worlds cleared. Bosses defeated.", (WIDTH//2, HEIGHT//2+5), BLACK, center=True)
+            + text_blits(self.font, "Press Enter or Esc to quit.", (WIDTH//2, HEIGHT//2+34), BLACK, center=True))
+        # Overworld "W1".."W5" labels frozen into one strip, blitted with a single call
+        label_blits = []
+        for i in range(5):
+            x = 100 + i* (WIDTH-200)//4
+            label_blits += text_blits(self.font, f"W{i+1}", (x, HEIGHT-150), BLACK, center=True)
+        bounds = [img.get_rect(topleft=dest[:2]) for img, dest in label_blits]
+        area = bounds[0].unionall(bounds)
+        self._world_labels = pygame.Surface(area.size, pygame.SRCALPHA).convert_alpha()
+        for img, r in zip((img for img, _ in label_blits), bounds):
+            self._world_labels.blit(img, (r.x - area.x, r.y - area.y))
+        self._world_labels_pos = area.topleft
+        # HUD heart rows: every heart full / every heart empty, sliced per frame
+        self._heart_strip_full = self._make_heart_strip(RED)
+        self._heart_strip_empty = self._make_heart_strip(GRAY)
+        # HUD stage label blits keyed on (world_index, stage_index)
+        self._hud_label_cache = {}
+        # Cache levels; the title screen builds one per tick while the curtains open
         self.level_cache = {}
+        self._preload_keys = [(w, s, s == c-1) for w, c in enumerate(self.world_stage_counts) for s in range(c)][::-1]
+        # Scene dispatch: state -> bound step/draw method
+        self._step_dispatch = {
+            STATE_TITLE: self.step_title,
+            STATE_OVERWORLD: self.step_overworld,
+            STATE_LEVEL: self.step_level,
+            STATE_BOSS: self.step_level,
+            STATE_ENDING: self.step_ending,
+        }
+        self._draw_dispatch = {
+            STATE_TITLE: self.draw_title,
+            STATE_OVERWORLD: self.draw_overworld,
+            STATE_LEVEL: self.draw_level,
+            STATE_BOSS: self.draw_level,
+            STATE_ENDING: self.draw_ending,
+        }
     # ------------------------------ Scenes ----------------------------------
     def run(self):
+        # Fixed-timestep loop: the current scene is stepped (events + simulation) in
+        # whole DT ticks, catching up after a slow frame, then drawn once if anything
+        # stepped. The loop then sleeps until the next tick is due, so the accumulator
+        # alone paces the game. Frame time is capped at 0.25 s so a long stall cannot
+        # snowball.
+        dt = 1.0 / FPS
+        prev = time.perf_counter()
+        accum = 0.0
         while True:
-            if self.state == STATE_TITLE:
-                self.loop_title()
-            elif self.state == STATE_OVERWORLD:
-                self.loop_overworld()
-            elif self.state == STATE_LEVEL:
-                self.loop_level(is_boss=False)
-            elif self.state == STATE_BOSS:
-                self.loop_level(is_boss=True)
-            elif self.state == STATE_ENDING:
-                self.loop_ending()
-            else:
-                pygame.quit()
-                sys.exit(0)
+            now = time.perf_counter()
+            accum += min(0.25, now - prev)
+            prev = now
+            if accum >= dt:
+                while accum >= dt:
+                    self.step()
+                    accum -= dt
+                dirty = self.draw()
+                if dirty is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty)
+            # Rounded up: waking early would only spin; the accumulator absorbs a late wake
+            pygame.time.wait(math.ceil((dt - accum) * 1000))
+    def step(self):
+        fn = self._step_dispatch.get(self.state)
+        if fn is None:
+            pygame.quit()
+            sys.exit(0)
+        fn()
+    def draw(self):
+        # Returns the rects that changed, or None when the whole screen must be presented
+        return self._draw_dispatch[self.state]()
     # ------------------------------ Title -----------------------------------
-    def loop_title(self):
-        for ev in pygame.event.get():
+    def step_title(self):
+        for ev in pygame.event.get(WATCHED_EVENTS):
             if ev.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             if ev.type == pygame.KEYDOWN:
@@ -725,41 +906,40 @@ class Game:
                     self.state = STATE_OVERWORLD
                 if ev.key == pygame.K_ESCAPE:
                     pygame.quit(); sys.exit(0)
+        if self._preload_keys:
+            self.get_level(*self._preload_keys.pop())
         # Curtain opening animation
         if self.title_curtain_pos < WIDTH // 2:
             self.title_curtain_pos = min(self.title_curtain_pos + 10, WIDTH // 2) # Open speed
+    def draw_title(self):
+        # Only the curtains move: skip frames where they didn't, else present the
+        # columns the previous curtains (and their scallop edges) covered
+        curtain_width = WIDTH // 2 - self.title_curtain_pos
+        shown = self._title_shown_width
+        if shown == curtain_width:
+            return []
+        self._title_shown_width = curtain_width
         # Draw SMB3-style title screen
         self.screen.fill(BEIGE) # Beige background like SMB3 title
         # Checkered floor at bottom
-        tile_size = 32
-        floor_height = tile_size * 2
-        for x in range(0, WIDTH, tile_size):
-            for y in range(HEIGHT - floor_height, HEIGHT, tile_size):
-                color = BLACK if ((x // tile_size) + ((y - (HEIGHT - floor_height)) // tile_size)) % 2 == 0 else WHITE
-                pygame.draw.rect(self.screen, color, (x, y, tile_size, tile_size))
+        self.screen.blit(self._title_floor, (0, HEIGHT - self._title_floor.get_height()))
         # Title text
-        text(self.screen, self.big, "Samsoft Ultra Simulator — SMB3-Style Engine", (WIDTH//2, HEIGHT//2-60), BLACK, center=True)
-        text(self.screen, self.font, "Node-map overworld • 5 Worlds × 3 Stages • Boom-style Boss each world", (WIDTH//2, HEIGHT//2-18), BLACK, center=True)
-        text(self.screen, self.font, "Press Enter to start • Esc to quit", (WIDTH//2, HEIGHT//2+26), BLACK, center=True)
+        self.screen.blits(self._title_blits, doreturn=False)
         # Draw parting curtains (procedural, inspired by SMB3 red curtains with scallops)
-        curtain_width = WIDTH // 2 - self.title_curtain_pos
         if curtain_width > 0:
             # Left curtain
             pygame.draw.rect(self.screen, RED, (0, 0, curtain_width, HEIGHT))
             # Add scallop pattern
-            for yy in range(0, HEIGHT, 20):
-                pygame.draw.arc(self.screen, BLACK, (curtain_width-10, yy, 20, 20), math.pi, 2*math.pi, 2)
+            self.screen.blit(self._scallop_left, (curtain_width-12, 0))
             # Right curtain
             pygame.draw.rect(self.screen, RED, (WIDTH - curtain_width, 0, curtain_width, HEIGHT))
-            for yy in range(0, HEIGHT, 20):
-                pygame.draw.arc(self.screen, BLACK, (WIDTH - curtain_width -10, yy, 20, 20), 0, math.pi, 2)
-        pygame.display.flip()
-        self.clock.tick(FPS)
+            self.screen.blit(self._scallop_right, (WIDTH - curtain_width - 12, 0))
+        if shown is None:
+            return None
+        return [pygame.Rect(0, 0, shown + 12, HEIGHT), pygame.Rect(WIDTH - shown - 12, 0, shown + 12, HEIGHT)]
     # ----------------------------- Overworld --------------------------------
-    def loop_overworld(self):
-        cleared = sum(1 for w in self.progress_clears for c in w if c)
-        progress_txt = f"Progress: {cleared}/{self.total_stages} stages cleared"
-        for ev in pygame.event.get():
+    def step_overworld(self):
+        for ev in pygame.event.get(WATCHED_EVENTS):
             if ev.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             if ev.type == pygame.KEYDOWN:
@@ -780,28 +960,36 @@ class Game:
                     self.overworld.move_cursor(0, -1)
                 if ev.key in (pygame.K_DOWN, pygame.K_s):
                     self.overworld.move_cursor(0, 1)
-        self.overworld.draw(self.screen, self.font, progress_txt)
-        for i in range(5):
-            lbl = f"W{i+1}"
-            x = 100 + i* (WIDTH-200)//4
-            text(self.screen, self.font, lbl, (x, HEIGHT-150), BLACK, center=True)
-        pygame.display.flip()
-        self.clock.tick(FPS)
+    def draw_overworld(self):
+        if self._progress_cache[1] != self._cleared_count:
+            progress_txt = f"Progress: {self._cleared_count}/{self.total_stages} stages cleared"
+            self._progress_cache = (text_blits(self.font, progress_txt, (WIDTH//2, 70), BLACK, center=True), self._cleared_count)
+        self.overworld.draw(self.screen, self.font, self._progress_cache[0])
+        self.screen.blit(self._world_labels, self._world_labels_pos)
     # ------------------------------ Level -----------------------------------
-    def start_level(self, is_boss=False):
-        key = (self.world_index, self.stage_index, is_boss)
+    def get_level(self, world, stage, is_boss):
+        key = (world, stage, is_boss)
         if key not in self.level_cache:
             if is_boss:
                 raw = make_boss_level()
             else:
-                seed = self.world_index*101 + self.stage_index*13 + 7
+                seed = world*101 + stage*13 + 7
                 raw = make_basic_level(seed=seed)
             self.level_cache[key] = Level.from_raw(raw)
-        self.level = self.level_cache[key]
+        return self.level_cache[key]
+    def start_level(self, is_boss=False):
+        self.level = self.get_level(self.world_index, self.stage_index, is_boss)
         self.player = Player(*self.level.spawn)
-        self.enemies = [Walker(e.rect.x, e.rect.y, dir=1) for e in self.level.enemies] # copy template enemies
+        # copy template enemies (shallow; only the mutable rect is duplicated)
+        self.enemies = []
+        for t in self.level.enemies:
+            e = copy.copy(t)
+            e.rect = t.rect.copy()
+            e.vx = abs(t.vx)  # copies always start walking right
+            self.enemies.append(e)
         self.projectiles = []
         self.camera_x = 0
+        self._cam_x_fp = 0
         self.boss = None
         if is_boss:
             diff = self.world_index # 0..4
@@ -811,7 +999,7 @@ class Game:
         else:
             self.state = STATE_LEVEL
     def level_common_events(self):
-        for ev in pygame.event.get():
+        for ev in pygame.event.get(WATCHED_EVENTS):
             if ev.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             if ev.type == pygame.KEYDOWN:
@@ -819,39 +1007,71 @@ class Game:
                     pygame.quit(); sys.exit(0)
                 if ev.key == pygame.K_r:
                     self.start_level(is_boss=(self.state==STATE_BOSS))
-    def loop_level(self, is_boss=False):
+    def step_level(self):
         self.level_common_events()
-        keys = pygame.key.get_pressed()
-        self.player.update(keys, self.level.solids, self.level.hazards, self.enemies, self.projectiles)
+        k = pygame.key.get_pressed()
+        inputs = (k[pygame.K_LEFT] or k[pygame.K_a],
+                  k[pygame.K_RIGHT] or k[pygame.K_d],
+                  k[pygame.K_LSHIFT] or k[pygame.K_RSHIFT],
+                  k[pygame.K_z] or k[pygame.K_k] or k[pygame.K_SPACE])
+        # Query a tile of margin around the player: it moves less than a tile per frame
+        near = self.level.solids_near(self.player.rect.inflate(2*TILE, 2*TILE))
+        self.player.update(inputs, near, self.level.hazards, self.enemies, self.projectiles)
         # Enemies
-        for e in self.enemies:
-            e.update(self.level.solids)
-        self.enemies = [e for e in self.enemies if e.alive or e.squash_timer > 0]
+        lst = self.enemies
+        # Off-screen enemies wait until the camera reaches them
+        left = self.camera_x - CULL_MARGIN
+        right = self.camera_x + WIDTH + CULL_MARGIN
+        step_walkers([e for e in lst if e.alive and e.rect.right >= left and e.rect.left <= right],
+                     self.level.solid_mask)
+        # Drop finished enemies in place (swap with the last, then pop)
+        i = 0
+        while i < len(lst):
+            e = lst[i]
+            if e.alive or e.squash_timer > 0:
+                i += 1
+            else:
+                lst[i] = lst[-1]
+                lst.pop()
         # Boss + projectiles
         if self.boss:
             self.boss.update(self.player, self.level.solids, self.projectiles)
         for p in self.projectiles:
-            p.update(self.level.solids)
-        self.projectiles = [p for p in self.projectiles if p.alive]
+            p.update(self.level.solids_near(p.rect.inflate(2*TILE, 2*TILE)))
+        lst = self.projectiles
+        i = 0
+        while i < len(lst):
+            if lst[i].alive:
+                i += 1
+            else:
+                lst[i] = lst[-1]
+                lst.pop()
         # Camera follow
         target_x = clamp(self.player.rect.centerx - WIDTH//2, 0, self.level.width - WIDTH)
-        self.camera_x += (target_x - self.camera_x) * 0.1
+        # Ease 1/8 of the way per tick in integer fixed point; draws get a plain int
+        self._cam_x_fp += (target_x*16 - self._cam_x_fp) >> 3
+        self.camera_x = self._cam_x_fp >> 4
         # Win conditions
         if self.state == STATE_LEVEL and self.level.goal and self.player.rect.colliderect(self.level.goal):
             self.on_level_clear()
             return
         if self.state == STATE_BOSS and self.boss and not self.boss.alive:
             self.on_level_clear()
-            return
-        # DRAW
+    def draw_level(self):
         theme = self.world_index % 2
         self.level.draw_bg(self.screen, self.camera_x, theme=theme)
         self.level.draw_tiles(self.screen, self.camera_x)
+        left = self.camera_x - CULL_MARGIN
+        right = self.camera_x + WIDTH + CULL_MARGIN
         # projectiles
         for p in self.projectiles:
+            if p.rect.right < left or p.rect.left > right:
+                continue
             p.draw(self.screen, self.camera_x)
         # enemies
         for e in self.enemies:
+            if e.rect.right < left or e.rect.left > right:
+                continue
             e.draw(self.screen, self.camera_x)
         # boss
         if self.boss:
@@ -859,10 +1079,10 @@ class Game:
         # player + HUD
         self.player.draw(self.screen, self.camera_x)
         self.draw_hud()
-        pygame.display.flip()
-        self.clock.tick(FPS)
     def on_level_clear(self):
         # mark progress, unlock next
+        if not self.progress_clears[self.world_index][self.stage_index]:
+            self._cleared_count += 1
         self.progress_clears[self.world_index][self.stage_index] = True
         self.overworld.unlock_path_after_clear(self.world_index, self.stage_index)
         # if final world/stage cleared:
@@ -871,30 +1091,42 @@ class Game:
         else:
             self.state = STATE_OVERWORLD
     # ----------------------------- Ending -----------------------------------
-    def loop_ending(self):
-        for ev in pygame.event.get():
+    def step_ending(self):
+        for ev in pygame.event.get(WATCHED_EVENTS):
             if ev.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             if ev.type == pygame.KEYDOWN:
                 if ev.key in (pygame.K_RETURN, pygame.K_ESCAPE):
                     pygame.quit(); sys.exit(0)
+    def draw_ending(self):
+        # Static screen: draw and present it once, then push nothing
+        if self._ending_shown:
+            return []
+        self._ending_shown = True
         self.screen.fill((245, 245, 255))
-        text(self.screen, self.big, "Thank you for playing!", (WIDTH//2, HEIGHT//2-40), BLACK, center=True)
-        text(self.screen, self.font, "All 5 worlds cleared. Bosses defeated.", (WIDTH//2, HEIGHT//2+5), BLACK, center=True)
-        text(self.screen, self.font, "Press Enter or Esc to quit.", (WIDTH//2, HEIGHT//2+34), BLACK, center=True)
-        pygame.display.flip()
-        self.clock.tick(FPS)
+        self.screen.blits(self._ending_blits, doreturn=False)
+        return None
     # ----------------------------- HUD --------------------------------------
+    def _make_heart_strip(self, color):
+        # Row of START_HEARTS hearts, 22px apart; blitted at (7, 7) so centres land at (16 + i*22, 16)
+        strip = keyed_surface((START_HEARTS*22, 19))
+        for i in range(START_HEARTS):
+            pygame.draw.circle(strip, BLACK, (9 + i*22, 9), 9)
+            pygame.draw.circle(strip, color, (9 + i*22, 9), 7)
+        return strip
     def draw_hud(self):
         # hearts
-        for i in range(self.player.max_hearts):
-            cx, cy = 16 + i*22, 16
-            pygame.draw.circle(self.screen, BLACK, (cx, cy), 9)
-            color = RED if i < self.player.hearts else GRAY
-            pygame.draw.circle(self.screen, color, (cx, cy), 7)
+        n = max(0, min(self.player.hearts, self.player.max_hearts))
+        rest = self.player.max_hearts - n
+        self.screen.blit(self._heart_strip_full, (7, 7), (0, 0, n*22, 19))
+        self.screen.blit(self._heart_strip_empty, (7 + n*22, 7), (n*22, 0, rest*22, 19))
         # world/stage label
-        lbl = f"W{self.world_index+1}-{self.stage_index+1}"
-        text(self.screen, self.font, lbl, (WIDTH-90, 14), BLACK)
+        key = (self.world_index, self.stage_index)
+        blits = self._hud_label_cache.get(key)
+        if blits is None:
+            lbl = f"W{self.world_index+1}-{self.stage_index+1}"
+            blits = self._hud_label_cache[key] = text_blits(self.font, lbl, (WIDTH-90, 14), BLACK)
+        self.screen.blits(blits, doreturn=False)
         # P-meter
         px, py = WIDTH//2 - 60, 14
         w, h = 120, 12
@@ -6,9 +6,9 @@ TETRIS — NES Edition
 Modified to match NES Tetris fully: main menu, all levels/killscreen, OST placeholders, B-Type, accurate mechanics, level-based palettes, high scores with name entry.
 Completely muted if music off; music generated dynamically with macro system.
 """
-import math, random, sys, pygame, json, os, numpy as np
+import functools, math, random, struct, sys, pygame, json, os, numpy as np
 from pygame import sndarray
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 # ───────── CONFIG ─────────
 GRID_WIDTH, GRID_HEIGHT = 10, 20
@@ -35,8 +35,10 @@ PALETTES = [
     (160, 33, 56), # 80-89: Red
     (199, 100, 78), # 90-99: Orange
 ]
+# Board cell values (uint8 array): 0 = empty, LOCKED = settled block
+EMPTY, LOCKED = 0, 1
 COLORS = {
-    'locked': (128, 128, 128), # Gray for locked pieces, as in NES
+    LOCKED: (128, 128, 128), # Gray for locked pieces, as in NES
 }
 NOTE_FREQ = {
     'A3': 220.0,
@@ -94,82 +96,161 @@ SHAPES: Dict[str, List[List[List[int]]]] = {
         [[0,0,1],[0,1,1],[0,1,0]],
     ],
 }
+SHAPES_LIST = tuple(SHAPES.keys())
+SHAPE_START_X = {k: GRID_WIDTH//2 - len(SHAPES[k][0][0])//2 for k in SHAPES_LIST} # Spawn column, centered
+# Filled (row, col) offsets of each rotation, keyed by (shape, rotation index)
+SHAPE_CELLS: Dict[Tuple[str, int], Tuple[Tuple[int, int], ...]] = {
+    (k, i): tuple((r, c) for r, row in enumerate(m) for c, v in enumerate(row) if v)
+    for k, mats in SHAPES.items() for i, m in enumerate(mats)
+}
+# Board rows packed as uint16 bitmasks (bit x = column x) for collision tests
+ROW_WEIGHTS = (1 << np.arange(GRID_WIDTH)).astype(np.uint16)
+FULL_ROW = (1 << GRID_WIDTH) - 1
+# Per rotation: (leftmost col, rightmost col, ((row, packed row mask), ...)) over non-empty rows
+SHAPE_MASKS: Dict[Tuple[str, int], Tuple[int, int, Tuple[Tuple[int, int], ...]]] = {
+    key: (min(c for _, c in cells), max(c for _, c in cells),
+          tuple((r, sum(1 << c for rr, c in cells if rr == r)) for r in sorted({r for r, _ in cells})))
+    for key, cells in SHAPE_CELLS.items()
+}
+# Per-cell board rects and pre-rendered block tiles (filled color + 1px BG_COLOR border)
+CELL_RECTS = [[pygame.Rect(x*BLOCK_SIZE, y*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE) for x in range(GRID_WIDTH)] for y in range(GRID_HEIGHT)]
+TILE_CACHE: Dict[Tuple[int, int, int], pygame.Surface] = {}
+# Rendered text keyed by (font id, string); HUD strings repeat until their value changes
+_TEXT_CACHE: Dict[Tuple[int, str], pygame.Surface] = {}
+TEXT_CACHE_MAX = 256
 # ───────── DATA CLASSES ─────────
 @dataclass
 class Piece:
     shape_key: str
-    matrix_index: int
+    rot: int
     x: int
     y: int
-    @property
-    def matrix(self): return SHAPES[self.shape_key][self.matrix_index % len(SHAPES[self.shape_key])]
-    def rotate(self): self.matrix_index = (self.matrix_index + 1) % len(SHAPES[self.shape_key])
+    _rots: List[List[List[int]]] = field(repr=False) # SHAPES[shape_key], bound at spawn
 # ───────── HELPERS ─────────
-def create_board(): return [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-def valid_position(p, board):
-    for r,row in enumerate(p.matrix):
-        for c,val in enumerate(row):
-            if not val: continue
-            nx, ny = p.x+c, p.y+r
-            if nx<0 or nx>=GRID_WIDTH or ny>=GRID_HEIGHT: return False
-            if ny>=0 and board[ny][nx] is not None: return False
+def create_board(): return np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8)
+def pack_rows(board): return (board @ ROW_WEIGHTS).astype(np.uint16)
+def shifted_masks(shape_key, rot, x):
+    return [(r, m << x if x >= 0 else m >> -x) for r, m in SHAPE_MASKS[(shape_key, rot)][2]]
+def valid_position(shape_key, rot, x, y, board_rows):
+    # Takes the candidate placement as plain values so move tests allocate no Piece
+    cmin, cmax, rows = SHAPE_MASKS[(shape_key, rot)]
+    if x+cmin<0 or x+cmax>=GRID_WIDTH: return False
+    for r,m in rows:
+        ny = y+r
+        if ny>=GRID_HEIGHT: return False
+        if ny>=0 and board_rows[ny] & (m << x if x >= 0 else m >> -x): return False
     return True
-def lock_piece(p, board):
-    for r,row in enumerate(p.matrix):
-        for c,val in enumerate(row):
-            if val:
-                x,y = p.x+c, p.y+r
-                if 0<=y<GRID_HEIGHT: board[y][x] = 'locked' # Use 'locked' for gray color
-def clear_lines(board):
-    new_board = [r for r in board if any(cell is None for cell in r)]
-    cleared = GRID_HEIGHT - len(new_board)
-    while len(new_board)<GRID_HEIGHT:
-        new_board.insert(0,[None]*GRID_WIDTH)
-    board[:] = new_board
+def drop_distance(p, board_rows):
+    # Rows the piece can fall before landing; x is fixed so walls need no re-check
+    masks = shifted_masks(p.shape_key, p.rot, p.x)
+    k = 0
+    while True:
+        for r,m in masks:
+            ny = p.y+r+k+1
+            if ny>=GRID_HEIGHT or (ny>=0 and board_rows[ny] & m): return k
+        k += 1
+def lock_piece(p, board, board_rows):
+    for r,c in SHAPE_CELLS[(p.shape_key, p.rot)]:
+        x,y = p.x+c, p.y+r
+        if 0<=y<GRID_HEIGHT:
+            board[y, x] = LOCKED # Drawn gray
+            board_rows[y] |= 1 << x
+def clear_lines(board, board_rows):
+    full = board_rows == FULL_ROW # One compare per packed row; the uint8 board follows for drawing
+    cleared = int(full.sum())
+    if cleared:
+        board[cleared:] = board[~full]
+        board[:cleared] = EMPTY
+        board_rows[cleared:] = board_rows[~full]
+        board_rows[:cleared] = 0
     return cleared
 def effective_level(lines, start_level): return max(start_level, lines // 10)
+def tile(color):
+    s = TILE_CACHE.get(color)
+    if s is None:
+        s = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE)).convert()
+        s.fill(color)
+        pygame.draw.rect(s, BG_COLOR, s.get_rect(), 1)
+        TILE_CACHE[color] = s
+    return s
 def draw_board(surf, board):
-    for y,row in enumerate(board):
-        for x,cell in enumerate(row):
-            rect = pygame.Rect(x*BLOCK_SIZE, y*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-            pygame.draw.rect(surf, GRID_COLOR if not cell else COLORS[cell], rect)
-            pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    surf.blits([(tile(COLORS[cell] if cell else GRID_COLOR), CELL_RECTS[y][x])
+                for y,row in enumerate(board.tolist()) for x,cell in enumerate(row)], doreturn=False)
 def draw_piece(surf, piece, color):
-    for r,row in enumerate(piece.matrix):
-        for c,val in enumerate(row):
-            if not val: continue
-            rect = pygame.Rect((piece.x+c)*BLOCK_SIZE, (piece.y+r)*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-            if rect.bottom<0: continue
-            pygame.draw.rect(surf, color, rect)
-            pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    t = tile(color)
+    for r,c in SHAPE_CELLS[(piece.shape_key, piece.rot)]:
+        if piece.y+r < -1: continue
+        surf.blit(t, ((piece.x+c)*BLOCK_SIZE, (piece.y+r)*BLOCK_SIZE))
+def piece_cells(p): return [(p.x+c, p.y+r) for r,c in SHAPE_CELLS[(p.shape_key, p.rot)]]
+def cell_rects(cells): return [CELL_RECTS[y][x] for x,y in cells if 0<=y<GRID_HEIGHT]
+def redraw_cells(surf, board, cells):
+    # Repaint the board tiles under (x, y) cells, e.g. to erase a moved piece; returns the rects touched
+    rects = cell_rects(cells)
+    for x,y in cells:
+        if 0<=y<GRID_HEIGHT:
+            cell = int(board[y, x])
+            surf.blit(tile(COLORS[cell] if cell else GRID_COLOR), CELL_RECTS[y][x])
+    return rects
 def draw_next(surf, piece, ox, oy, color):
-    for r,row in enumerate(piece.matrix):
-        for c,val in enumerate(row):
-            if val:
-                rect = pygame.Rect(ox+c*BLOCK_SIZE, oy+r*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-                pygame.draw.rect(surf, color, rect)
-                pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    t = tile(color)
+    for r,c in SHAPE_CELLS[(piece.shape_key, piece.rot)]:
+        surf.blit(t, (ox+c*BLOCK_SIZE, oy+r*BLOCK_SIZE))
+PANEL_RECT = pygame.Rect(GRID_WIDTH * BLOCK_SIZE, 0, SIDE_PANEL_WIDTH, SCREEN_HEIGHT)
+def draw_panel(surf, font_l, font_s, score, lines, level, nxt, color, show_next):
+    surf.fill(BG_COLOR, PANEL_RECT)
+    px = PANEL_RECT.x + 12
+    render_text(surf, font_l, "TETRIS", (px, 20))
+    render_text(surf, font_s, f"Score: {score}", (px, 100))
+    render_text(surf, font_s, f"Lines: {lines}", (px, 130))
+    render_text(surf, font_s, f"Level: {level}", (px, 160))
+    if show_next:
+        render_text(surf, font_s, "Next:", (px, 210))
+        box = pygame.Rect(px, 240, 4 * BLOCK_SIZE, 4 * BLOCK_SIZE)
+        surf.fill((0, 0, 0), box)
+        surf.set_clip(box) # Next piece stays inside its box
+        draw_next(surf, nxt, box.x + BLOCK_SIZE // 2, box.y + BLOCK_SIZE // 2, color)
+        surf.set_clip(None)
+    if level >= 29:
+        render_text(surf, font_s, "Level 29 — Killscreen!", (px, 360))
+    return PANEL_RECT
 def render_text(surf, font, text, pos):
-    surf.blit(font.render(text, True, TEXT_COLOR), pos)
+    key = (id(font), text)
+    img = _TEXT_CACHE.pop(key, None)
+    if img is None:
+        if len(_TEXT_CACHE) >= TEXT_CACHE_MAX: del _TEXT_CACHE[next(iter(_TEXT_CACHE))] # Least recently used
+        img = font.render(text, True, TEXT_COLOR).convert_alpha()
+    _TEXT_CACHE[key] = img # Hits go back in last, keeping the dict in recency order
+    surf.blit(img, pos)
 def spawn(last_key):
-    shapes_list = list(SHAPES.keys())
     roll = random.randrange(8)
-    if roll == 7 or (last_key is not None and shapes_list[roll % 7] == last_key):
+    if roll == 7 or (last_key is not None and SHAPES_LIST[roll % 7] == last_key):
         roll = random.randrange(7)
-    s = shapes_list[roll % 7]
-    m = SHAPES[s][0]
-    startx = GRID_WIDTH//2 - len(m[0])//2
-    return Piece(s, 0, startx, -2), s
-def game_over(board): return any(board[0][x] is not None for x in range(GRID_WIDTH))
+    s = SHAPES_LIST[roll % 7]
+    return Piece(s, 0, SHAPE_START_X[s], -2, SHAPES[s]), s
+def game_over(board_rows): return bool(board_rows[0])
+# High scores: 3 (score, name) slots for A then 3 for B; unused slots have a blank name
+HIGH_SCORES_FILE = 'highscores.bin'
+HIGH_SCORES_FMT = '<' + 'I3s' * 6
 def load_high_scores():
     try:
-        with open('highscores.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {'A': [], 'B': []}
+        with open(HIGH_SCORES_FILE, 'rb') as f:
+            data = struct.unpack(HIGH_SCORES_FMT, f.read())
+    except (FileNotFoundError, struct.error):
+        try: # Older installs kept the table as JSON
+            with open('highscores.json', 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'A': [], 'B': []}
+    slots = [(score, name.decode('ascii')) for score, name in zip(data[0::2], data[1::2])]
+    return {'A': [e for e in slots[:3] if e[1].strip()], 'B': [e for e in slots[3:] if e[1].strip()]}
 def save_high_scores(high_scores):
-    with open('highscores.json', 'w') as f:
-        json.dump(high_scores, f)
+    flat = []
+    for key in ('A', 'B'):
+        entries = [(int(score), name.encode('ascii')) for score, name in high_scores[key][:3]]
+        entries += [(0, b'   ')] * (3 - len(entries))
+        for score, name in entries: flat += [score, name]
+    with open(HIGH_SCORES_FILE, 'wb') as f:
+        f.write(struct.pack(HIGH_SCORES_FMT, *flat))
 def enter_name(screen, font_s):
     running = True
     name = list('AAA')
@@ -192,6 +273,48 @@ def enter_name(screen, font_s):
         render_text(screen, font_s, ''.join(name), (SCREEN_WIDTH // 2 - 40, 200))
         pygame.display.flip()
     return ''.join(name)
+@functools.lru_cache(maxsize=256)
+def _synth_note(wave_type, freq, samples, volume, duty, adsr, sample_rate):
+    # Shared between callers: the returned array is read-only
+    # 32-bit phase accumulator: uint32 wraparound replaces the per-sample modulo,
+    # and the phase stays exact however long the note runs
+    step = np.uint32(round(freq / sample_rate * 2**32) % 2**32)
+    phase = np.arange(samples, dtype=np.uint32)
+    phase *= step
+    # Each wave is built in one buffer with in-place ufuncs, no per-step temporaries
+    wave = np.empty(samples, dtype=np.float32)
+    if wave_type == 'square':
+        np.less(phase, np.uint32(min(int(duty * 2**32), 2**32 - 1)), out=wave, casting='unsafe')
+        wave *= 2 * volume
+        wave -= volume
+    elif wave_type == 'triangle':
+        np.multiply(phase, 2.0 / 2**32, out=wave)
+        wave -= 1
+        np.abs(wave, out=wave)
+        wave *= 2
+        wave -= 1
+        wave *= volume
+    elif wave_type == 'noise':
+        np.multiply(np.random.uniform(-1, 1, samples).astype(np.float32, copy=False), volume, out=wave)
+    else:
+        wave.fill(0)
+    # Apply ADSR
+    a, d, s, r = adsr
+    attack_s = int(sample_rate * a)
+    decay_s = int(sample_rate * d)
+    release_s = int(sample_rate * r)
+    sustain_s = samples - attack_s - decay_s - release_s
+    if sustain_s < 0: sustain_s = 0
+    # Scale each segment of the wave in place; a note shorter than A+D+R is cut off
+    a_end = min(attack_s, samples)
+    d_end = min(attack_s + decay_s, samples)
+    r_start = min(attack_s + decay_s + sustain_s, samples)
+    wave[:a_end] *= np.linspace(0, 1, attack_s, dtype=np.float32)[:a_end]
+    wave[a_end:d_end] *= np.linspace(1, s, decay_s, dtype=np.float32)[:d_end - a_end]
+    wave[d_end:r_start] *= s
+    wave[r_start:] *= np.linspace(s, 0, release_s, dtype=np.float32)[:samples - r_start]
+    wave.flags.writeable = False
+    return wave
 class SoundMacro:
     def __init__(self, sample_rate=22050):
         self.sample_rate = sample_rate
@@ -201,36 +324,15 @@ class SoundMacro:
         self.adsr = (0.01, 0.01, 0.8, 0.01)  # attack, decay, sustain, release
     def generate_note(self, freq, dur):
         samples = int(self.sample_rate * dur)
-        t = np.arange(samples) / self.sample_rate
-        if self.wave_type == 'square':
-            phase = 2 * np.pi * freq * t
-            wave = ((phase % (2 * np.pi) < 2 * np.pi * self.duty) * 2 - 1) * self.volume
-        elif self.wave_type == 'triangle':
-            wave = (2 * np.abs(2 * (freq * t % 1) - 1) - 1) * self.volume
-        elif self.wave_type == 'noise':
-            wave = np.random.uniform(-1, 1, samples) * self.volume
-        else:
-            wave = np.zeros(samples)
-        # Apply ADSR
-        a, d, s, r = self.adsr
-        attack_s = int(self.sample_rate * a)
-        decay_s = int(self.sample_rate * d)
-        release_s = int(self.sample_rate * r)
-        sustain_s = samples - attack_s - decay_s - release_s
-        if sustain_s < 0: sustain_s = 0
-        env = np.concatenate([
-            np.linspace(0, 1, attack_s),
-            np.linspace(1, s, decay_s),
-            np.ones(sustain_s) * s,
-            np.linspace(s, 0, release_s),
-        ])
-        if len(env) > samples: env = env[:samples]
-        elif len(env) < samples: env = np.pad(env, (0, samples - len(env)), 'constant')
-        wave *= env
-        return wave
+        # Noise differs on every call, so only the deterministic waves go through the cache
+        synth = _synth_note.__wrapped__ if self.wave_type == 'noise' else _synth_note
+        return synth(self.wave_type, freq, samples, self.volume, self.duty, self.adsr, self.sample_rate)
     def execute_macro(self, macro, tempo=150):
-        wave = np.array([], dtype=np.float32)
         beat_dur = 60 / tempo
+        # Size the output once up front, then write each note into its slice
+        total = sum(int(self.sample_rate * (cmd['dur'] * beat_dur)) for cmd in macro if cmd['type'] in ('play', 'rest'))
+        wave = np.zeros(total, dtype=np.float32)
+        pos = 0
         for cmd in macro:
             if cmd['type'] == 'set_wave':
                 self.wave_type = cmd['wave']
@@ -242,16 +344,30 @@ class SoundMacro:
                 freq = NOTE_FREQ.get(cmd['note'], 0)
                 dur = cmd['dur'] * beat_dur
                 note_wave = self.generate_note(freq, dur)
-                wave = np.append(wave, note_wave)
+                wave[pos:pos + len(note_wave)] = note_wave
+                pos += len(note_wave)
             elif cmd['type'] == 'rest':
                 dur = cmd['dur'] * beat_dur
-                rest = np.zeros(int(self.sample_rate * dur))
-                wave = np.append(wave, rest)
-        return wave
+                pos += int(self.sample_rate * dur)  # already silent
+        return wave[:pos]
+def make_stereo_sound(mixed):
+    # Normalizes mixed in place, then fills both int16 channels of one buffer
+    mixed /= np.abs(mixed).max()
+    mixed *= 32767
+    stereo = np.empty((len(mixed), 2), dtype=np.int16)
+    stereo[:] = mixed[:, None]
+    return sndarray.make_sound(stereo)
 def play_music(music_choice):
     pygame.mixer.music.stop()
     if music_choice == 0:
         return
+    sound = build_music(music_choice)
+    if sound is not None:
+        sound.stop() # Restart from the top rather than layering a second copy
+        sound.play(-1)
+@functools.lru_cache(maxsize=None)
+def build_music(music_choice):
+    # Synthesized on first use only; later games replay the same Sound
     sample_rate = 22050
     melody_engine = SoundMacro(sample_rate)
     bass_engine = SoundMacro(sample_rate)
@@ -364,15 +480,12 @@ def play_music(music_choice):
     if music_choice == 1:
         melody_wave = melody_engine.execute_macro(melody_macro)
         bass_wave = bass_engine.execute_macro(bass_macro)
-        max_len = max(len(melody_wave), len(bass_wave))
-        melody_wave = np.pad(melody_wave, (0, max_len - len(melody_wave)), 'constant')
-        bass_wave = np.pad(bass_wave, (0, max_len - len(bass_wave)), 'constant')
-        mixed = melody_wave + bass_wave
-        mixed = (mixed / np.abs(mixed).max() * 32767).astype(np.int16)
-        mixed_stereo = np.stack((mixed, mixed), axis=1)
-        sound = sndarray.make_sound(mixed_stereo)
-        sound.play(-1)
+        mixed = np.zeros(max(len(melody_wave), len(bass_wave)), dtype=np.float32)
+        mixed[:len(melody_wave)] += melody_wave
+        mixed[:len(bass_wave)] += bass_wave
+        return make_stereo_sound(mixed)
     # For music_choice 2 and 3, add similar macros; currently silent
+    return None
 def main_menu(screen, clock, font_l, font_s):
     options = {'type': 'A', 'level': 0, 'height': 0, 'music': 1}
     selected = 0
@@ -431,10 +544,7 @@ def game_over_screen(screen, font_l, font_s, score, lines, level, b_type, won, h
                 {'type': 'play', 'note': 'C6', 'dur': 2},
             ]
             wave = engine.execute_macro(victory_macro)
-            mixed = wave * 0.3
-            mixed = (mixed / np.abs(mixed).max() * 32767).astype(np.int16)
-            mixed_stereo = np.stack((mixed, mixed), axis=1)
-            sound = sndarray.make_sound(mixed_stereo)
+            sound = make_stereo_sound(wave * 0.3)
             sound.play(0)  # Play once
     running = True
     while running:
@@ -476,11 +586,12 @@ def main():
         board = create_board()
         if b_type:
             garbage_heights = [0, 3, 5, 8, 10, 12][height]
-            for i in range(garbage_heights):
-                row = [random.choice(list(SHAPES.keys())) for _ in range(GRID_WIDTH)]
-                hole = random.randint(0, GRID_WIDTH - 1)
-                row[hole] = None
-                board[GRID_HEIGHT - 1 - i] = row
+            if garbage_heights:
+                # Fill the bottom rows at once, then punch one random hole per row
+                board[GRID_HEIGHT - garbage_heights:] = LOCKED
+                holes = np.random.randint(0, GRID_WIDTH, size=garbage_heights)
+                board[np.arange(GRID_HEIGHT - garbage_heights, GRID_HEIGHT), holes] = EMPTY
+        board_rows = pack_rows(board)
         last_key = None
         cur, cur_key = spawn(last_key)
         last_key = cur_key
@@ -490,6 +601,7 @@ def main():
         soft = False
         running = True
         won = False
+        full_redraw = True
         while running:
             dt = clock.tick(FPS) / 1000
             fall_t += dt
@@ -508,33 +620,29 @@ def main():
                 elif e.type == pygame.KEYDOWN:
                     if e.key == pygame.K_ESCAPE: running = False
                     elif e.key == pygame.K_LEFT:
-                        p = Piece(cur.shape_key, cur.matrix_index, cur.x - 1, cur.y)
-                        if valid_position(p, board): cur.x -= 1
+                        if valid_position(cur.shape_key, cur.rot, cur.x - 1, cur.y, board_rows): cur.x -= 1
                     elif e.key == pygame.K_RIGHT:
-                        p = Piece(cur.shape_key, cur.matrix_index, cur.x + 1, cur.y)
-                        if valid_position(p, board): cur.x += 1
+                        if valid_position(cur.shape_key, cur.rot, cur.x + 1, cur.y, board_rows): cur.x += 1
                     elif e.key == pygame.K_DOWN: soft = True
                     elif e.key in (pygame.K_UP, pygame.K_x):
-                        r = Piece(cur.shape_key, cur.matrix_index, cur.x, cur.y); r.rotate()
-                        if valid_position(r, board): cur.rotate()
+                        rot = (cur.rot + 1) % len(cur._rots)
+                        if valid_position(cur.shape_key, rot, cur.x, cur.y, board_rows): cur.rot = rot
                     elif e.key in (pygame.K_z, pygame.K_LCTRL):
-                        r = Piece(cur.shape_key, cur.matrix_index, cur.x, cur.y)
-                        r.matrix_index = (cur.matrix_index - 1) % len(SHAPES[cur.shape_key])
-                        if valid_position(r, board): cur.matrix_index = r.matrix_index
+                        rot = (cur.rot - 1) % len(cur._rots)
+                        if valid_position(cur.shape_key, rot, cur.x, cur.y, board_rows): cur.rot = rot
                     elif e.key == pygame.K_SPACE:
-                        while valid_position(Piece(cur.shape_key, cur.matrix_index, cur.x, cur.y + 1), board):
-                            cur.y += 1
+                        cur.y += drop_distance(cur, board_rows)
                         fall_t = spd
                 elif e.type == pygame.KEYUP and e.key == pygame.K_DOWN: soft = False
             if fall_t >= spd:
                 fall_t -= spd
-                mv = Piece(cur.shape_key, cur.matrix_index, cur.x, cur.y + 1)
-                if valid_position(mv, board):
+                if valid_position(cur.shape_key, cur.rot, cur.x, cur.y + 1, board_rows):
                     cur.y += 1
                     if soft: score += 1 # NES soft drop points
                 else:
-                    lock_piece(cur, board)
-                    cleared = clear_lines(board)
+                    lock_piece(cur, board, board_rows)
+                    full_redraw = True
+                    cleared = clear_lines(board, board_rows)
                     if cleared:
                         lines += cleared
                         base = {1: 40, 2: 100, 3: 300, 4: 1200}
@@ -543,29 +651,31 @@ def main():
                     last_key = nxt_key
                     nxt, nxt_key = spawn(last_key)
                     last_key = nxt_key
-                    if not valid_position(cur, board) or game_over(board):
+                    if not valid_position(cur.shape_key, cur.rot, cur.x, cur.y, board_rows) or game_over(board_rows):
                         running = False
                     if b_type and lines >= 25:
                         running = False
                         won = True
-            screen.fill(BG_COLOR)
-            pf = pygame.Surface((GRID_WIDTH * BLOCK_SIZE, SCREEN_HEIGHT))
-            draw_board(pf, board)
-            draw_piece(pf, cur, current_piece_color)
-            screen.blit(pf, (0, 0))
-            px = GRID_WIDTH * BLOCK_SIZE + 12
-            render_text(screen, font_l, "TETRIS", (px, 20))
-            render_text(screen, font_s, f"Score: {score}", (px, 100))
-            render_text(screen, font_s, f"Lines: {lines}", (px, 130))
-            render_text(screen, font_s, f"Level: {level}", (px, 160))
-            if show_next:
-                render_text(screen, font_s, "Next:", (px, 210))
-                ns = pygame.Surface((4 * BLOCK_SIZE, 4 * BLOCK_SIZE))
-                draw_next(ns, nxt, BLOCK_SIZE // 2, BLOCK_SIZE // 2, current_piece_color)
-                screen.blit(ns, (px, 240))
-            if level >= 29:
-                render_text(screen, font_s, "Level 29 — Killscreen!", (px, 360))
-            pygame.display.flip()
+            # Present only what changed; anything that alters the board repaints the whole frame
+            piece_state = (cur.shape_key, cur.rot, cur.x, cur.y, current_piece_color)
+            panel_state = (score, lines, level, nxt.shape_key, nxt.rot, current_piece_color)
+            if full_redraw:
+                screen.fill(BG_COLOR)
+                draw_board(screen, board) # Cells sit at their absolute coordinates in the left of the screen
+                draw_piece(screen, cur, current_piece_color)
+                draw_panel(screen, font_l, font_s, score, lines, level, nxt, current_piece_color, show_next)
+                pygame.display.flip()
+                full_redraw = False
+            else:
+                dirty = []
+                if piece_state != drawn_piece:
+                    dirty += redraw_cells(screen, board, drawn_cells)
+                    draw_piece(screen, cur, current_piece_color)
+                    dirty += cell_rects(piece_cells(cur))
+                if panel_state != drawn_panel:
+                    dirty.append(draw_panel(screen, font_l, font_s, score, lines, level, nxt, current_piece_color, show_next))
+                pygame.display.update(dirty)
+            drawn_piece, drawn_panel, drawn_cells = piece_state, panel_state, piece_cells(cur)
         # High score handling
         type_key = 'B' if b_type else 'A'
         scores = high_scores[type_key]
@@ -7,8 +7,8 @@ Modified to match NES Tetris fully: main menu, all levels/killscreen, OST placeh
 Completely muted if music off; music loads with error handling if files missing.
 """
 
-import math, random, sys, pygame, json
-from dataclasses import dataclass
+import math, os, sys, pygame, json, numpy as np
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 
 # ───────── CONFIG ─────────
@@ -78,95 +78,222 @@ SHAPES: Dict[str, List[List[List[int]]]] = {
     ],
 }
 
+# Board colors: uint8 grid, 0 = empty, 1..7 = id of the shape that locked there
+SHAPE_IDS = {k: i + 1 for i, k in enumerate(SHAPES)}
+# Filled (row, col) offsets of each rotation: FILLED_CELLS[shape][rotation index]
+FILLED_CELLS = {k: [tuple((r, c) for r, row in enumerate(m) for c, v in enumerate(row) if v) for m in mats]
+                for k, mats in SHAPES.items()}
+# Lowest filled row of each column a rotation covers: (col, row) pairs, for hard drops
+BOTTOM_CELLS = {k: [tuple((c, max(r for r, cc in cells if cc == c)) for c in sorted({cc for _, cc in cells}))
+                    for cells in rots]
+                for k, rots in FILLED_CELLS.items()}
+SHAPE_START_X = {k: GRID_WIDTH // 2 - len(mats[0][0]) // 2 for k, mats in SHAPES.items()}
+SHAPES_LIST = list(SHAPES)
+
+# Piece rolls are drawn in bulk from one generator and handed out one at a time
+_RNG = np.random.default_rng()
+_ROLLS: List[int] = []
+RNG_POOL_SIZE = 4096
+# Occupancy bitboard: bit y*GRID_WIDTH + x is set when cell (x, y) is filled
+ROW_MASK = (1 << GRID_WIDTH) - 1
+FLOOR_MASK = -1 << (GRID_WIDTH * GRID_HEIGHT)  # every bit below the last row
+ROW_LSB = sum(1 << (r * GRID_WIDTH) for r in range(GRID_HEIGHT))  # lowest bit of every row
+# Board-sized mask of each rotation with its top-left at (x, 0); x outside the wall bounds has no entry
+PIECE_MASKS = {
+    (k, i, x): sum(1 << (r * GRID_WIDTH + x + c) for r, c in cells)
+    for k, rots in FILLED_CELLS.items() for i, cells in enumerate(rots)
+    for x in range(-min(c for _, c in cells), GRID_WIDTH - max(c for _, c in cells))
+}
+
+# Screen rect of every board cell, CELL_RECTS[y][x]
+CELL_RECTS = [[pygame.Rect(x*BLOCK_SIZE, y*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE) for x in range(GRID_WIDTH)]
+              for y in range(GRID_HEIGHT)]
+# Pre-rendered BLOCK_SIZE tiles with the BG_COLOR border baked in, keyed by fill color
+TILE_CACHE: Dict[Tuple[int, int, int], pygame.Surface] = {}
+# Rendered HUD strings keyed by (font, text); labels and recent values stay resident
+_TEXT_CACHE: Dict[Tuple[int, str], pygame.Surface] = {}
+TEXT_CACHE_MAX = 256
+
 # ───────── DATA CLASSES ─────────
-@dataclass
+@dataclass(slots=True)
 class Piece:
     shape_key: str
     matrix_index: int
     x: int
     y: int
-    @property
-    def matrix(self): return SHAPES[self.shape_key][self.matrix_index % len(SHAPES[self.shape_key])]
-    def rotate(self): self.matrix_index = (self.matrix_index + 1) % len(SHAPES[self.shape_key])
+
+@dataclass
+class Board:
+    color_ids: np.ndarray  # shape id per cell, read only when drawing
+    occ: int = 0           # occupancy bitboard, the only thing collision tests read
+    col_occ: List[int] = field(default_factory=lambda: [0] * GRID_WIDTH)  # bit y = row y filled, for hard drops
 
 # ───────── HELPERS ─────────
-def create_board(): return [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+def create_board(): return Board(np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8))
+
+def piece_mask(shape_key, matrix_index, x, y):
+    m = PIECE_MASKS.get((shape_key, matrix_index, x))
+    if m is None: return None
+    s = y * GRID_WIDTH
+    return m << s if s >= 0 else m >> -s  # rows above the top fall off
 
-def valid_position(p, board):
-    for r,row in enumerate(p.matrix):
-        for c,val in enumerate(row):
-            if not val: continue
-            nx, ny = p.x+c, p.y+r
-            if nx<0 or nx>=GRID_WIDTH or ny>=GRID_HEIGHT: return False
-            if ny>=0 and board[ny][nx] is not None: return False
-    return True
+def valid_position(shape_key, matrix_index, x, y, board):
+    m = piece_mask(shape_key, matrix_index, x, y)
+    return m is not None and not m & (board.occ | FLOOR_MASK)
+
+def pack_cells(cells):
+    return int.from_bytes(np.packbits(cells.ravel() != 0, bitorder='little').tobytes(), 'little')
+
+def pack_cols(cells):
+    return [int.from_bytes(col.tobytes(), 'little') for col in np.packbits(cells.T != 0, axis=1, bitorder='little')]
+
+def unpack_occ(occ):
+    n = GRID_WIDTH * GRID_HEIGHT
+    bits = np.unpackbits(np.frombuffer(occ.to_bytes((n + 7) // 8, 'little'), dtype=np.uint8), bitorder='little')
+    return bits[:n].reshape(GRID_HEIGHT, GRID_WIDTH)
 
 def lock_piece(p, board):
-    for r,row in enumerate(p.matrix):
-        for c,val in enumerate(row):
-            if val:
-                x,y = p.x+c, p.y+r
-                if 0<=y<GRID_HEIGHT: board[y][x] = 'locked'  # Use 'locked' for gray color
+    board.occ |= piece_mask(p.shape_key, p.matrix_index, p.x, p.y)
+    sid = SHAPE_IDS[p.shape_key]  # Any locked cell draws 'locked' gray
+    for r,c in FILLED_CELLS[p.shape_key][p.matrix_index]:
+        if 0 <= p.y+r < GRID_HEIGHT:
+            board.color_ids[p.y+r, p.x+c] = sid
+            board.col_occ[p.x+c] |= 1 << (p.y+r)
+
+def drop_distance(p, board):
+    # Rows the piece can fall: the smallest gap under the lowest cell of each column it covers
+    dist = GRID_HEIGHT
+    for c,r in BOTTOM_CELLS[p.shape_key][p.matrix_index]:
+        y = p.y+r+1  # first row under this column's lowest cell
+        below = board.col_occ[p.x+c]
+        below = below >> y if y >= 0 else below << -y
+        gap = (below & -below).bit_length() - 1 if below else GRID_HEIGHT - y
+        if gap < dist: dist = gap
+    return dist
+
+def full_rows(occ):
+    # Bit r*GRID_WIDTH survives the AND of all in-row shifts only if every cell of row r is set
+    t = occ
+    for k in range(1, GRID_WIDTH): t &= occ >> k
+    return t & ROW_LSB
 
 def clear_lines(board):
-    new_board = [r for r in board if any(cell is None for cell in r)]
-    cleared = GRID_HEIGHT - len(new_board)
-    while len(new_board)<GRID_HEIGHT:
-        new_board.insert(0,[None]*GRID_WIDTH)
-    board[:] = new_board
+    if not full_rows(board.occ): return 0  # the usual lock: nothing to clear
+    occ = unpack_occ(board.occ)
+    full = occ.all(axis=1)
+    cleared = int(full.sum())
+    for plane in (occ, board.color_ids):  # same row mask on both planes
+        plane[cleared:] = plane[~full]
+        plane[:cleared] = 0
+    board.occ = pack_cells(occ)
+    board.col_occ = pack_cols(occ)
     return cleared
 
 def effective_level(lines, start_level): return max(start_level, lines // 10)
 
+def level_speed_color(level):
+    # Seconds per gravity row and piece color; both only change with the level
+    frames_per_row = GRAVITY_TABLE[min(level, len(GRAVITY_TABLE) - 1)]
+    # Simulate palette index (normal for <100, glitched gray for >=100)
+    palette_index = level // 10
+    color = PALETTES[palette_index] if palette_index < 10 else (128, 128, 128)  # Gray for glitched/killscreen
+    return frames_per_row / FPS, color
+
+def tile(color):
+    s = TILE_CACHE.get(color)
+    if s is None:
+        s = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE)).convert()
+        s.fill(color)
+        pygame.draw.rect(s, BG_COLOR, s.get_rect(), 1)
+        TILE_CACHE[color] = s
+    return s
+
 def draw_board(surf, board):
-    for y,row in enumerate(board):
-        for x,cell in enumerate(row):
-            rect = pygame.Rect(x*BLOCK_SIZE, y*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-            pygame.draw.rect(surf, GRID_COLOR if not cell else COLORS[cell], rect)
-            pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    empty, locked = tile(GRID_COLOR), tile(COLORS['locked'])
+    surf.blits([(locked if cell else empty, rect)
+                for cells,rects in zip(board.color_ids.tolist(), CELL_RECTS) for cell,rect in zip(cells,rects)], doreturn=False)
 
 def draw_piece(surf, piece, color):
-    for r,row in enumerate(piece.matrix):
-        for c,val in enumerate(row):
-            if not val: continue
-            rect = pygame.Rect((piece.x+c)*BLOCK_SIZE, (piece.y+r)*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-            if rect.bottom<0: continue
-            pygame.draw.rect(surf, color, rect)
-            pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    t = tile(color)
+    surf.blits([(t, ((piece.x+c)*BLOCK_SIZE, (piece.y+r)*BLOCK_SIZE))
+                for r,c in FILLED_CELLS[piece.shape_key][piece.matrix_index] if piece.y+r >= -1], doreturn=False)
 
 def draw_next(surf, piece, ox, oy, color):
-    for r,row in enumerate(piece.matrix):
-        for c,val in enumerate(row):
-            if val:
-                rect = pygame.Rect(ox+c*BLOCK_SIZE, oy+r*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-                pygame.draw.rect(surf, color, rect)
-                pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    t = tile(color)
+    surf.blits([(t, (ox+c*BLOCK_SIZE, oy+r*BLOCK_SIZE))
+                for r,c in FILLED_CELLS[piece.shape_key][piece.matrix_index]], doreturn=False)
+
+def piece_cells(p): return [(p.x+c, p.y+r) for r,c in FILLED_CELLS[p.shape_key][p.matrix_index]]
+
+def cell_rects(cells): return [CELL_RECTS[y][x] for x,y in cells if 0<=y<GRID_HEIGHT]
+
+def redraw_cells(surf, board, cells):
+    # Repaint the board tiles under (x, y) cells, e.g. to erase a moved piece; returns the rects touched
+    empty, locked = tile(GRID_COLOR), tile(COLORS['locked'])
+    seq = [(locked if board.color_ids[y, x] else empty, CELL_RECTS[y][x]) for x,y in cells if 0<=y<GRID_HEIGHT]
+    surf.blits(seq, doreturn=False)
+    return [rect for _, rect in seq]
+
+PANEL_RECT = pygame.Rect(GRID_WIDTH * BLOCK_SIZE, 0, SIDE_PANEL_WIDTH, SCREEN_HEIGHT)
+
+def draw_panel(surf, ns, font_l, font_s, score, lines, level, nxt, color, show_next):
+    surf.fill(BG_COLOR, PANEL_RECT)
+    px = PANEL_RECT.x + 12
+    seq = [(text_surf(font_l, "TETRIS"), (px, 20)),
+           (text_surf(font_s, f"Score: {score}"), (px, 100)),
+           (text_surf(font_s, f"Lines: {lines}"), (px, 130)),
+           (text_surf(font_s, f"Level: {level}"), (px, 160))]
+    if show_next:
+        ns.fill((0, 0, 0))
+        draw_next(ns, nxt, BLOCK_SIZE // 2, BLOCK_SIZE // 2, color)
+        seq += [(text_surf(font_s, "Next:"), (px, 210)), (ns, (px, 240))]
+    if level >= 29:
+        seq.append((text_surf(font_s, "Level 29 — Killscreen!"), (px, 360)))
+    surf.blits(seq, doreturn=False)
+    return PANEL_RECT
+
+def text_surf(font, text):
+    key = (id(font), text)
+    img = _TEXT_CACHE.pop(key, None)
+    if img is None:
+        if len(_TEXT_CACHE) >= TEXT_CACHE_MAX: del _TEXT_CACHE[next(iter(_TEXT_CACHE))]  # Evict least recently used
+        img = font.render(text, True, TEXT_COLOR).convert_alpha()
+    _TEXT_CACHE[key] = img  # Move to the most recent end
+    return img
 
 def render_text(surf, font, text, pos):
-    surf.blit(font.render(text, True, TEXT_COLOR), pos)
+    surf.blit(text_surf(font, text), pos)
+
+def roll8():
+    if not _ROLLS: _ROLLS.extend(_RNG.integers(0, 8, size=RNG_POOL_SIZE, dtype=np.uint8).tolist())
+    return _ROLLS.pop()
 
 def spawn(last_key):
-    shapes_list = list(SHAPES.keys())
-    roll = random.randrange(8)
-    if roll == 7 or (last_key is not None and shapes_list[roll % 7] == last_key):
-        roll = random.randrange(7)
-    s = shapes_list[roll % 7]
-    m = SHAPES[s][0]
-    startx = GRID_WIDTH//2 - len(m[0])//2
-    return Piece(s, 0, startx, -2), s
+    roll = roll8()
+    if roll == 7 or (last_key is not None and SHAPES_LIST[roll] == last_key):
+        roll = roll8()
+        while roll == 7: roll = roll8()  # reroll is uniform over the 7 shapes
+    s = SHAPES_LIST[roll]
+    return Piece(s, 0, SHAPE_START_X[s], -2), s
+
+def game_over(board): return bool(board.occ & ROW_MASK)
 
-def game_over(board): return any(board[0][x] is not None for x in range(GRID_WIDTH))
+HIGH_SCORES_FILE = 'highscores.json'
+HIGH_SCORES_BUFFER = 1 << 16
 
 def load_high_scores():
     try:
-        with open('highscores.json', 'r') as f:
+        with open(HIGH_SCORES_FILE, 'r', buffering=HIGH_SCORES_BUFFER) as f:
             return json.load(f)
     except FileNotFoundError:
         return {'A': [], 'B': []}
 
 def save_high_scores(high_scores):
-    with open('highscores.json', 'w') as f:
-        json.dump(high_scores, f)
+    # Write compact JSON to a temp file in one buffered flush, then swap it in atomically
+    tmp = HIGH_SCORES_FILE + '.tmp'
+    with open(tmp, 'w', buffering=HIGH_SCORES_BUFFER) as f:
+        json.dump(high_scores, f, separators=(',', ':'))
+    os.replace(tmp, HIGH_SCORES_FILE)
 
 def enter_name(screen, font_s):
     running = True
@@ -191,49 +318,55 @@ def enter_name(screen, font_s):
         pygame.display.flip()
     return ''.join(name)
 
-def main_menu(screen, clock, font_l, font_s):
+def main_menu(screen, font_l, font_s):
     options = {'type': 'A', 'level': 0, 'height': 0, 'music': 1}
     selected = 0
     items = ['type', 'level', 'height', 'music']  # Removed 'next'
     running = True
+    needs_redraw = True
     while running:
-        dt = clock.tick(FPS) / 1000
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT: sys.exit()
-            if e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_ESCAPE: sys.exit()
-                if e.key == pygame.K_UP: selected = (selected - 1) % len(items)
-                if e.key == pygame.K_DOWN: selected = (selected + 1) % len(items)
-                if e.key == pygame.K_LEFT:
-                    if items[selected] == 'type': options['type'] = 'B' if options['type'] == 'A' else 'A'
-                    if items[selected] == 'level': options['level'] = (options['level'] - 1) % 20
-                    if items[selected] == 'height' and options['type'] == 'B': options['height'] = (options['height'] - 1) % 6
-                    if items[selected] == 'music': options['music'] = (options['music'] - 1) % 4
-                if e.key == pygame.K_RIGHT:
-                    if items[selected] == 'type': options['type'] = 'B' if options['type'] == 'A' else 'A'
-                    if items[selected] == 'level': options['level'] = (options['level'] + 1) % 20
-                    if items[selected] == 'height' and options['type'] == 'B': options['height'] = (options['height'] + 1) % 6
-                    if items[selected] == 'music': options['music'] = (options['music'] + 1) % 4
-                if e.key == pygame.K_RETURN or e.key == pygame.K_SPACE: running = False
-        screen.fill(BG_COLOR)
-        render_text(screen, font_l, "TETRIS", (SCREEN_WIDTH // 2 - 100, 50))
-        y = 120
-        render_text(screen, font_s, f"Type: {options['type']}", (100, y))
-        pygame.draw.rect(screen, TEXT_COLOR if selected == 0 else BG_COLOR, (90, y - 5, 200, 30), 1)
-        y += 40
-        render_text(screen, font_s, f"Level: {options['level']}", (100, y))
-        pygame.draw.rect(screen, TEXT_COLOR if selected == 1 else BG_COLOR, (90, y - 5, 200, 30), 1)
-        y += 40
-        if options['type'] == 'B':
-            render_text(screen, font_s, f"Height: {options['height']}", (100, y))
-            pygame.draw.rect(screen, TEXT_COLOR if selected == 2 else BG_COLOR, (90, y - 5, 200, 30), 1)
-            y += 40
-        render_text(screen, font_s, f"Music: {'Off' if options['music'] == 0 else options['music']}", (100, y))
-        pygame.draw.rect(screen, TEXT_COLOR if selected == (3 if options['type'] == 'A' else 3) else BG_COLOR, (90, y - 5, 200, 30), 1)
-        pygame.display.flip()
+        if needs_redraw:  # The menu is static, so it is only repainted after a key press
+            draw_menu(screen, font_l, font_s, options, selected)
+            needs_redraw = False
+        e = pygame.event.wait()  # Sleep until input instead of spinning at FPS
+        if e.type == pygame.QUIT: sys.exit()
+        if e.type == pygame.KEYDOWN:
+            needs_redraw = True
+            if e.key == pygame.K_ESCAPE: sys.exit()
+            if e.key == pygame.K_UP: selected = (selected - 1) % len(items)
+            if e.key == pygame.K_DOWN: selected = (selected + 1) % len(items)
+            if e.key == pygame.K_LEFT:
+                if items[selected] == 'type': options['type'] = 'B' if options['type'] == 'A' else 'A'
+                if items[selected] == 'level': options['level'] = (options['level'] - 1) % 20
+                if items[selected] == 'height' and options['type'] == 'B': options['height'] = (options['height'] - 1) % 6
+                if items[selected] == 'music': options['music'] = (options['music'] - 1) % 4
+            if e.key == pygame.K_RIGHT:
+                if items[selected] == 'type': options['type'] = 'B' if options['type'] == 'A' else 'A'
+                if items[selected] == 'level': options['level'] = (options['level'] + 1) % 20
+                if items[selected] == 'height' and options['type'] == 'B': options['height'] = (options['height'] + 1) % 6
+                if items[selected] == 'music': options['music'] = (options['music'] + 1) % 4
+            if e.key == pygame.K_RETURN or e.key == pygame.K_SPACE: running = False
     options['next'] = True  # Always on for NES authenticity
     return options
 
+def draw_menu(screen, font_l, font_s, options, selected):
+    screen.fill(BG_COLOR)
+    render_text(screen, font_l, "TETRIS", (SCREEN_WIDTH // 2 - 100, 50))
+    y = 120
+    render_text(screen, font_s, f"Type: {options['type']}", (100, y))
+    pygame.draw.rect(screen, TEXT_COLOR if selected == 0 else BG_COLOR, (90, y - 5, 200, 30), 1)
+    y += 40
+    render_text(screen, font_s, f"Level: {options['level']}", (100, y))
+    pygame.draw.rect(screen, TEXT_COLOR if selected == 1 else BG_COLOR, (90, y - 5, 200, 30), 1)
+    y += 40
+    if options['type'] == 'B':
+        render_text(screen, font_s, f"Height: {options['height']}", (100, y))
+        pygame.draw.rect(screen, TEXT_COLOR if selected == 2 else BG_COLOR, (90, y - 5, 200, 30), 1)
+        y += 40
+    render_text(screen, font_s, f"Music: {'Off' if options['music'] == 0 else options['music']}", (100, y))
+    pygame.draw.rect(screen, TEXT_COLOR if selected == (3 if options['type'] == 'A' else 3) else BG_COLOR, (90, y - 5, 200, 30), 1)
+    pygame.display.flip()
+
 def game_over_screen(screen, font_l, font_s, score, lines, level, b_type, won, high_scores, type_key):
     pygame.mixer.music.stop()
     try:
@@ -274,11 +407,17 @@ def main():
     clock = pygame.time.Clock()
     font_s = pygame.font.SysFont("fira sans", 18)
     font_l = pygame.font.SysFont("fira sans", 36, bold=True)
+    # Reused every frame: draw_board covers all of pf, ns is cleared to black
+    pf = pygame.Surface((GRID_WIDTH * BLOCK_SIZE, SCREEN_HEIGHT)).convert()
+    ns = pygame.Surface((4 * BLOCK_SIZE, 4 * BLOCK_SIZE)).convert()
 
     high_scores = load_high_scores()
+    # Names the frame loop calls every iteration, bound once instead of looked up per frame
+    tick, event_get, update = clock.tick, pygame.event.get, pygame.display.update
+    scores_dirty = False
 
     while True:  # Loop back to menu after game
-        options = main_menu(screen, clock, font_l, font_s)
+        options = main_menu(screen, font_l, font_s)
         start_level = options['level']
         b_type = options['type'] == 'B'
         height = options['height']
@@ -295,11 +434,11 @@ def main():
         board = create_board()
         if b_type:
             garbage_heights = [0, 3, 5, 8, 10, 12][height]
-            for i in range(garbage_heights):
-                row = [random.choice(list(SHAPES.keys())) for _ in range(GRID_WIDTH)]
-                hole = random.randint(0, GRID_WIDTH - 1)
-                row[hole] = None
-                board[GRID_HEIGHT - 1 - i] = row
+            rows = _RNG.integers(1, len(SHAPES) + 1, size=(garbage_heights, GRID_WIDTH), dtype=np.uint8)
+            rows[np.arange(garbage_heights), _RNG.integers(0, GRID_WIDTH, size=garbage_heights)] = 0  # one hole per row
+            board.color_ids[GRID_HEIGHT - garbage_heights:] = rows
+            board.occ = pack_cells(board.color_ids)
+            board.col_occ = pack_cols(board.color_ids)
 
         last_key = None
         cur, cur_key = spawn(last_key)
@@ -307,103 +446,100 @@ def main():
         nxt, nxt_key = spawn(last_key)
         last_key = nxt_key
         fall_t, lines, score = 0, 0, 0
+        level = start_level if b_type else effective_level(lines, start_level)
+        spd_base, current_piece_color = level_speed_color(level)
         soft = False
         running = True
         won = False
+        full_redraw = True
 
         while running:
-            dt = clock.tick(FPS) / 1000
+            dt = tick(FPS) / 1000
             fall_t += dt
-            level = start_level if b_type else effective_level(lines, start_level)
-            frames_per_row = GRAVITY_TABLE[min(level, len(GRAVITY_TABLE) - 1)]
-            spd = frames_per_row / FPS
-            if soft: spd /= 2  # NES soft drop: twice the speed (half the time interval)
-
-            # Simulate palette index (normal for <100, glitched gray for >=100)
-            palette_index = level // 10
-            if palette_index < 10:
-                current_piece_color = PALETTES[palette_index]
-            else:
-                current_piece_color = (128, 128, 128)  # Gray for glitched/killscreen
+            spd = spd_base / 2 if soft else spd_base  # NES soft drop: twice the speed (half the time interval)
 
-            for e in pygame.event.get():
+            for e in event_get():
                 if e.type == pygame.QUIT: running = False
                 elif e.type == pygame.KEYDOWN:
                     if e.key == pygame.K_ESCAPE: running = False
                     elif e.key == pygame.K_LEFT:
-                        p = Piece(cur.shape_key, cur.matrix_index, cur.x - 1, cur.y)
-                        if valid_position(p, board): cur.x -= 1
+                        if valid_position(cur.shape_key, cur.matrix_index, cur.x - 1, cur.y, board): cur.x -= 1
                     elif e.key == pygame.K_RIGHT:
-                        p = Piece(cur.shape_key, cur.matrix_index, cur.x + 1, cur.y)
-                        if valid_position(p, board): cur.x += 1
+                        if valid_position(cur.shape_key, cur.matrix_index, cur.x + 1, cur.y, board): cur.x += 1
                     elif e.key == pygame.K_DOWN: soft = True
                     elif e.key in (pygame.K_UP, pygame.K_x):
-                        r = Piece(cur.shape_key, cur.matrix_index, cur.x, cur.y); r.rotate()
-                        if valid_position(r, board): cur.rotate()
+                        rot = (cur.matrix_index + 1) % len(SHAPES[cur.shape_key])
+                        if valid_position(cur.shape_key, rot, cur.x, cur.y, board): cur.matrix_index = rot
                     elif e.key in (pygame.K_z, pygame.K_LCTRL):
-                        r = Piece(cur.shape_key, cur.matrix_index, cur.x, cur.y)
-                        r.matrix_index = (cur.matrix_index - 1) % len(SHAPES[cur.shape_key])
-                        if valid_position(r, board): cur.matrix_index = r.matrix_index
+                        rot = (cur.matrix_index - 1) % len(SHAPES[cur.shape_key])
+                        if valid_position(cur.shape_key, rot, cur.x, cur.y, board): cur.matrix_index = rot
                     elif e.key == pygame.K_SPACE:
-                        while valid_position(Piece(cur.shape_key, cur.matrix_index, cur.x, cur.y + 1), board):
-                            cur.y += 1
+                        cur.y += drop_distance(cur, board)
                         fall_t = spd
                 elif e.type == pygame.KEYUP and e.key == pygame.K_DOWN: soft = False
 
             if fall_t >= spd:
                 fall_t -= spd
-                mv = Piece(cur.shape_key, cur.matrix_index, cur.x, cur.y + 1)
-                if valid_position(mv, board):
+                if valid_position(cur.shape_key, cur.matrix_index, cur.x, cur.y + 1, board):
                     cur.y += 1
                     if soft: score += 1  # NES soft drop points
                 else:
                     lock_piece(cur, board)
+                    full_redraw = True
                     cleared = clear_lines(board)
                     if cleared:
                         lines += cleared
                         base = {1: 40, 2: 100, 3: 300, 4: 1200}
                         score += base.get(cleared, 1200) * (level + 1)
+                        level = start_level if b_type else effective_level(lines, start_level)
+                        spd_base, current_piece_color = level_speed_color(level)
                     cur, nxt = nxt, spawn(last_key)
                     last_key = nxt_key
                     nxt, nxt_key = spawn(last_key)
                     last_key = nxt_key
-                    if not valid_position(cur, board) or game_over(board):
+                    if not valid_position(cur.shape_key, cur.matrix_index, cur.x, cur.y, board) or game_over(board):
                         running = False
                     if b_type and lines >= 25:
                         running = False
                         won = True
 
-            screen.fill(BG_COLOR)
-            pf = pygame.Surface((GRID_WIDTH * BLOCK_SIZE, SCREEN_HEIGHT))
-            draw_board(pf, board)
-            draw_piece(pf, cur, current_piece_color)
-            screen.blit(pf, (0, 0))
-            px = GRID_WIDTH * BLOCK_SIZE + 12
-            render_text(screen, font_l, "TETRIS", (px, 20))
-            render_text(screen, font_s, f"Score: {score}", (px, 100))
-            render_text(screen, font_s, f"Lines: {lines}", (px, 130))
-            render_text(screen, font_s, f"Level: {level}", (px, 160))
-            if show_next:
-                render_text(screen, font_s, "Next:", (px, 210))
-                ns = pygame.Surface((4 * BLOCK_SIZE, 4 * BLOCK_SIZE))
-                draw_next(ns, nxt, BLOCK_SIZE // 2, BLOCK_SIZE // 2, current_piece_color)
-                screen.blit(ns, (px, 240))
-            if level >= 29:
-                render_text(screen, font_s, "Level 29 — Killscreen!", (px, 360))
-            pygame.display.flip()
+            # Present only what changed; anything that alters the board repaints the whole frame
+            piece_state = (cur.shape_key, cur.matrix_index, cur.x, cur.y, current_piece_color)
+            panel_state = (score, lines, level, nxt.shape_key, nxt.matrix_index, current_piece_color)
+            if full_redraw:
+                screen.fill(BG_COLOR)
+                draw_board(pf, board)
+                draw_piece(pf, cur, current_piece_color)
+                screen.blit(pf, (0, 0))
+                draw_panel(screen, ns, font_l, font_s, score, lines, level, nxt, current_piece_color, show_next)
+                pygame.display.flip()
+                full_redraw = False
+            else:
+                dirty = []
+                if piece_state != drawn_piece:
+                    dirty += redraw_cells(pf, board, drawn_cells)
+                    draw_piece(pf, cur, current_piece_color)
+                    dirty += cell_rects(piece_cells(cur))
+                    screen.blits([(pf, r, r) for r in dirty], doreturn=False)
+                if panel_state != drawn_panel:
+                    dirty.append(draw_panel(screen, ns, font_l, font_s, score, lines, level, nxt, current_piece_color, show_next))
+                update(dirty)
+            drawn_piece, drawn_panel, drawn_cells = piece_state, panel_state, piece_cells(cur)
 
         # High score handling
         type_key = 'B' if b_type else 'A'
         scores = high_scores[type_key]
         if len(scores) < 3 or score > min(s[0] for s in scores):
             name = enter_name(screen, font_s)
-            scores.append((score, name))
-            scores = sorted(scores, key=lambda x: x[0], reverse=True)[:3]
+            scores = sorted(scores + [(score, name)], key=lambda x: x[0], reverse=True)[:3]
+            scores_dirty |= scores != high_scores[type_key]
             high_scores[type_key] = scores
-            save_high_scores(high_scores)
 
         game_over_screen(screen, font_l, font_s, score, lines, level, b_type, won, high_scores, type_key)
         pygame.mixer.music.stop()
+        if scores_dirty:  # Persist once per game, on the way back to the menu
+            save_high_scores(high_scores)
+            scores_dirty = False
 
     pygame.quit(); sys.exit()
 
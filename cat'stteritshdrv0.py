@@ -7,8 +7,8 @@ Classic 29-level progression → authentic killscreen speed simulation.
 Completely muted (no audio system initialized).
 """
 
-import math, random, sys, pygame
-from dataclasses import dataclass
+import math, sys, pygame, numpy as np
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 
 # ───────── CONFIG ─────────
@@ -70,83 +70,194 @@ COLORS = {
     "Z": (255,60,60),
 }
 
+# Board colors: uint8 grid, 0 = empty, 1..7 = id of the shape that locked there
+SHAPE_IDS = {k: i + 1 for i, k in enumerate(SHAPES)}
+# Filled (row, col) offsets of each rotation: FILLED_CELLS[shape][rotation index]
+FILLED_CELLS = {k: [tuple((r, c) for r, row in enumerate(m) for c, v in enumerate(row) if v) for m in mats]
+                for k, mats in SHAPES.items()}
+# Lowest filled row of each column a rotation covers: (col, row) pairs, for hard drops
+BOTTOM_CELLS = {k: [tuple((c, max(r for r, cc in cells if cc == c)) for c in sorted({cc for _, cc in cells}))
+                    for cells in rots]
+                for k, rots in FILLED_CELLS.items()}
+SHAPE_START_X = {k: GRID_WIDTH // 2 - len(mats[0][0]) // 2 for k, mats in SHAPES.items()}
+SHAPES_LIST = list(SHAPES)
+
+# 7-bags are shuffled in bulk from one generator and handed out one at a time
+_RNG = np.random.default_rng()
+_BAGS: List[List[int]] = []
+RNG_POOL_BAGS = 512
+# Occupancy bitboard: bit y*GRID_WIDTH + x is set when cell (x, y) is filled
+ROW_MASK = (1 << GRID_WIDTH) - 1
+FLOOR_MASK = -1 << (GRID_WIDTH * GRID_HEIGHT)  # every bit below the last row
+ROW_LSB = sum(1 << (r * GRID_WIDTH) for r in range(GRID_HEIGHT))  # lowest bit of every row
+# Board-sized mask of each rotation with its top-left at (x, 0); x outside the wall bounds has no entry
+PIECE_MASKS = {
+    (k, i, x): sum(1 << (r * GRID_WIDTH + x + c) for r, c in cells)
+    for k, rots in FILLED_CELLS.items() for i, cells in enumerate(rots)
+    for x in range(-min(c for _, c in cells), GRID_WIDTH - max(c for _, c in cells))
+}
+CELL_COLORS = [GRID_COLOR] + [COLORS[k] for k in SHAPES]  # indexed by cell value
+
+# Screen rect of every board cell, CELL_RECTS[y][x]
+CELL_RECTS = [[pygame.Rect(x*BLOCK_SIZE, y*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE) for x in range(GRID_WIDTH)]
+              for y in range(GRID_HEIGHT)]
+# Pre-rendered BLOCK_SIZE tiles with the BG_COLOR border baked in, keyed by fill color
+TILE_CACHE: Dict[Tuple[int, int, int], pygame.Surface] = {}
+# Rendered HUD strings keyed by (font, text); labels and recent values stay resident
+_TEXT_CACHE: Dict[Tuple[int, str], pygame.Surface] = {}
+TEXT_CACHE_MAX = 256
+
 # ───────── DATA CLASSES ─────────
-@dataclass
+@dataclass(slots=True)
 class Piece:
     shape_key: str
     matrix_index: int
     x: int
     y: int
-    @property
-    def matrix(self): return SHAPES[self.shape_key][self.matrix_index % len(SHAPES[self.shape_key])]
-    def rotate(self): self.matrix_index = (self.matrix_index + 1) % len(SHAPES[self.shape_key])
+
+@dataclass
+class Board:
+    color_ids: np.ndarray  # shape id per cell, read only when drawing
+    occ: int = 0           # occupancy bitboard, the only thing collision tests read
+    col_occ: List[int] = field(default_factory=lambda: [0] * GRID_WIDTH)  # bit y = row y filled, for hard drops
 
 # ───────── HELPERS ─────────
-def create_board(): return [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-def get_bag(): bag = list(SHAPES.keys()); random.shuffle(bag); return bag
-
-def valid_position(p, board):
-    for r,row in enumerate(p.matrix):
-        for c,val in enumerate(row):
-            if not val: continue
-            nx, ny = p.x+c, p.y+r
-            if nx<0 or nx>=GRID_WIDTH or ny>=GRID_HEIGHT: return False
-            if ny>=0 and board[ny][nx] is not None: return False
-    return True
+def create_board(): return Board(np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8))
+def get_bag():
+    if not _BAGS: _BAGS.extend(_RNG.permuted(np.tile(np.arange(len(SHAPES)), (RNG_POOL_BAGS, 1)), axis=1).tolist())
+    return [SHAPES_LIST[i] for i in _BAGS.pop()]
+
+def piece_mask(shape_key, matrix_index, x, y):
+    m = PIECE_MASKS.get((shape_key, matrix_index, x))
+    if m is None: return None
+    s = y * GRID_WIDTH
+    return m << s if s >= 0 else m >> -s  # rows above the top fall off
+
+def valid_position(shape_key, matrix_index, x, y, board):
+    m = piece_mask(shape_key, matrix_index, x, y)
+    return m is not None and not m & (board.occ | FLOOR_MASK)
+
+def pack_cells(cells):
+    return int.from_bytes(np.packbits(cells.ravel() != 0, bitorder='little').tobytes(), 'little')
+
+def pack_cols(cells):
+    return [int.from_bytes(col.tobytes(), 'little') for col in np.packbits(cells.T != 0, axis=1, bitorder='little')]
+
+def unpack_occ(occ):
+    n = GRID_WIDTH * GRID_HEIGHT
+    bits = np.unpackbits(np.frombuffer(occ.to_bytes((n + 7) // 8, 'little'), dtype=np.uint8), bitorder='little')
+    return bits[:n].reshape(GRID_HEIGHT, GRID_WIDTH)
 
 def lock_piece(p, board):
-    for r,row in enumerate(p.matrix):
-        for c,val in enumerate(row):
-            if val:
-                x,y = p.x+c, p.y+r
-                if 0<=y<GRID_HEIGHT: board[y][x] = p.shape_key
+    board.occ |= piece_mask(p.shape_key, p.matrix_index, p.x, p.y)
+    sid = SHAPE_IDS[p.shape_key]
+    for r,c in FILLED_CELLS[p.shape_key][p.matrix_index]:
+        if 0 <= p.y+r < GRID_HEIGHT:
+            board.color_ids[p.y+r, p.x+c] = sid
+            board.col_occ[p.x+c] |= 1 << (p.y+r)
+
+def drop_distance(p, board):
+    # Rows the piece can fall: the smallest gap under the lowest cell of each column it covers
+    dist = GRID_HEIGHT
+    for c,r in BOTTOM_CELLS[p.shape_key][p.matrix_index]:
+        y = p.y+r+1  # first row under this column's lowest cell
+        below = board.col_occ[p.x+c]
+        below = below >> y if y >= 0 else below << -y
+        gap = (below & -below).bit_length() - 1 if below else GRID_HEIGHT - y
+        if gap < dist: dist = gap
+    return dist
+
+def full_rows(occ):
+    # Bit r*GRID_WIDTH survives the AND of all in-row shifts only if every cell of row r is set
+    t = occ
+    for k in range(1, GRID_WIDTH): t &= occ >> k
+    return t & ROW_LSB
 
 def clear_lines(board):
-    new_board = [r for r in board if any(cell is None for cell in r)]
-    cleared = GRID_HEIGHT - len(new_board)
-    while len(new_board)<GRID_HEIGHT:
-        new_board.insert(0,[None]*GRID_WIDTH)
-    board[:] = new_board
+    if not full_rows(board.occ): return 0  # the usual lock: nothing to clear
+    occ = unpack_occ(board.occ)
+    full = occ.all(axis=1)
+    cleared = int(full.sum())
+    for plane in (occ, board.color_ids):  # same row mask on both planes
+        plane[cleared:] = plane[~full]
+        plane[:cleared] = 0
+    board.occ = pack_cells(occ)
+    board.col_occ = pack_cols(occ)
     return cleared
 
 def calc_level(lines): return min(MAX_LEVEL, lines//LINES_PER_LEVEL)
 def fall_speed(lv): return 0.02 if lv>=MAX_LEVEL else max(0.05, 0.8 - (lv*0.05))
 
+def tile(color):
+    s = TILE_CACHE.get(color)
+    if s is None:
+        s = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE)).convert()
+        s.fill(color)
+        pygame.draw.rect(s, BG_COLOR, s.get_rect(), 1)
+        TILE_CACHE[color] = s
+    return s
+
 def draw_board(surf, board):
-    for y,row in enumerate(board):
-        for x,cell in enumerate(row):
-            rect = pygame.Rect(x*BLOCK_SIZE, y*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-            pygame.draw.rect(surf, GRID_COLOR if not cell else COLORS[cell], rect)
-            pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    tiles = [tile(c) for c in CELL_COLORS]
+    surf.blits([(tiles[cell], rect)
+                for cells,rects in zip(board.color_ids.tolist(), CELL_RECTS) for cell,rect in zip(cells,rects)], doreturn=False)
 
 def draw_piece(surf, piece):
-    for r,row in enumerate(piece.matrix):
-        for c,val in enumerate(row):
-            if not val: continue
-            rect = pygame.Rect((piece.x+c)*BLOCK_SIZE, (piece.y+r)*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-            if rect.bottom<0: continue
-            pygame.draw.rect(surf, COLORS[piece.shape_key], rect)
-            pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    t = tile(COLORS[piece.shape_key])
+    surf.blits([(t, ((piece.x+c)*BLOCK_SIZE, (piece.y+r)*BLOCK_SIZE))
+                for r,c in FILLED_CELLS[piece.shape_key][piece.matrix_index] if piece.y+r >= -1], doreturn=False)
 
 def draw_next(surf, piece, ox, oy):
-    for r,row in enumerate(piece.matrix):
-        for c,val in enumerate(row):
-            if val:
-                rect = pygame.Rect(ox+c*BLOCK_SIZE, oy+r*BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
-                pygame.draw.rect(surf, COLORS[piece.shape_key], rect)
-                pygame.draw.rect(surf, BG_COLOR, rect, 1)
+    t = tile(COLORS[piece.shape_key])
+    surf.blits([(t, (ox+c*BLOCK_SIZE, oy+r*BLOCK_SIZE))
+                for r,c in FILLED_CELLS[piece.shape_key][piece.matrix_index]], doreturn=False)
+
+def piece_cells(p): return [(p.x+c, p.y+r) for r,c in FILLED_CELLS[p.shape_key][p.matrix_index]]
+
+def cell_rects(cells): return [CELL_RECTS[y][x] for x,y in cells if 0<=y<GRID_HEIGHT]
+
+def redraw_cells(surf, board, cells):
+    # Repaint the board tiles under (x, y) cells, e.g. to erase a moved piece; returns the rects touched
+    seq = [(tile(CELL_COLORS[board.color_ids[y, x]]), CELL_RECTS[y][x]) for x,y in cells if 0<=y<GRID_HEIGHT]
+    surf.blits(seq, doreturn=False)
+    return [rect for _, rect in seq]
+
+PANEL_RECT = pygame.Rect(GRID_WIDTH*BLOCK_SIZE, 0, SIDE_PANEL_WIDTH, SCREEN_HEIGHT)
+
+def draw_panel(surf, ns, font_l, font_s, score, lines, level, nxt):
+    surf.fill(BG_COLOR, PANEL_RECT)
+    px = PANEL_RECT.x+12
+    ns.fill((0,0,0))
+    draw_next(ns,nxt,BLOCK_SIZE//2,BLOCK_SIZE//2)
+    seq = [(text_surf(font_l,"ULTRA!TETRIS"),(px,20)),
+           (text_surf(font_s,f"Score: {score}"),(px,100)),
+           (text_surf(font_s,f"Lines: {lines}"),(px,130)),
+           (text_surf(font_s,f"Level: {level}"),(px,160)),
+           (text_surf(font_s,"Next:"),(px,210)),
+           (ns,(px,240))]
+    if level>=MAX_LEVEL:
+        seq.append((text_surf(font_s,"Level 29 — Killscreen!"),(px,360)))
+    surf.blits(seq, doreturn=False)
+    return PANEL_RECT
+
+def text_surf(font, text):
+    key = (id(font), text)
+    img = _TEXT_CACHE.pop(key, None)
+    if img is None:
+        if len(_TEXT_CACHE) >= TEXT_CACHE_MAX: del _TEXT_CACHE[next(iter(_TEXT_CACHE))]  # Evict least recently used
+        img = font.render(text, True, TEXT_COLOR).convert_alpha()
+    _TEXT_CACHE[key] = img  # Move to the most recent end
+    return img
 
 def render_text(surf, font, text, pos):
-    surf.blit(font.render(text, True, TEXT_COLOR), pos)
+    surf.blit(text_surf(font, text), pos)
 
 def spawn(bag):
     if not bag: bag.extend(get_bag())
     s = bag.pop()
-    m = SHAPES[s][0]
-    startx = GRID_WIDTH//2 - len(m[0])//2
-    return Piece(s, 0, startx, -2)
+    return Piece(s, 0, SHAPE_START_X[s], -2)
 
-def game_over(board): return any(board[0][x] for x in range(GRID_WIDTH))
+def game_over(board): return bool(board.occ & ROW_MASK)
 
 # ───────── MAIN LOOP ─────────
 def main():
@@ -156,74 +267,82 @@ def main():
     clock = pygame.time.Clock()
     font_s = pygame.font.SysFont("fira sans", 18)
     font_l = pygame.font.SysFont("fira sans", 36, bold=True)
+    # Reused every frame: draw_board covers all of pf, ns is cleared to black
+    pf = pygame.Surface((GRID_WIDTH*BLOCK_SIZE, SCREEN_HEIGHT)).convert()
+    ns = pygame.Surface((4*BLOCK_SIZE,4*BLOCK_SIZE)).convert()
 
     board = create_board()
     bag=[]
     cur, nxt = spawn(bag), spawn(bag)
     fall_t, lines, level, score = 0,0,0,0
+    spd_base = fall_speed(level)
     soft=False; running=True
+    full_redraw=True
+    # Names the frame loop calls every iteration, bound once instead of looked up per frame
+    tick, event_get, update = clock.tick, pygame.event.get, pygame.display.update
 
     while running:
-        dt = clock.tick(FPS)/1000
+        dt = tick(FPS)/1000
         fall_t += dt
-        level = calc_level(lines)
-        spd = fall_speed(level)
-        if soft: spd = min(0.02, spd/3)
+        spd = min(0.02, spd_base/3) if soft else spd_base
 
-        for e in pygame.event.get():
+        for e in event_get():
             if e.type==pygame.QUIT: running=False
             elif e.type==pygame.KEYDOWN:
                 if e.key==pygame.K_ESCAPE: running=False
                 elif e.key==pygame.K_LEFT:
-                    p=Piece(cur.shape_key,cur.matrix_index,cur.x-1,cur.y)
-                    if valid_position(p,board): cur.x-=1
+                    if valid_position(cur.shape_key,cur.matrix_index,cur.x-1,cur.y,board): cur.x-=1
                 elif e.key==pygame.K_RIGHT:
-                    p=Piece(cur.shape_key,cur.matrix_index,cur.x+1,cur.y)
-                    if valid_position(p,board): cur.x+=1
+                    if valid_position(cur.shape_key,cur.matrix_index,cur.x+1,cur.y,board): cur.x+=1
                 elif e.key==pygame.K_DOWN: soft=True
                 elif e.key in (pygame.K_UP,pygame.K_x):
-                    r=Piece(cur.shape_key,cur.matrix_index,cur.x,cur.y); r.rotate()
-                    if valid_position(r,board): cur.rotate()
+                    rot=(cur.matrix_index+1)%len(SHAPES[cur.shape_key])
+                    if valid_position(cur.shape_key,rot,cur.x,cur.y,board): cur.matrix_index=rot
                 elif e.key in (pygame.K_z,pygame.K_LCTRL):
-                    r=Piece(cur.shape_key,cur.matrix_index,cur.x,cur.y)
-                    r.matrix_index=(cur.matrix_index-1)%len(SHAPES[cur.shape_key])
-                    if valid_position(r,board): cur.matrix_index=r.matrix_index
+                    rot=(cur.matrix_index-1)%len(SHAPES[cur.shape_key])
+                    if valid_position(cur.shape_key,rot,cur.x,cur.y,board): cur.matrix_index=rot
                 elif e.key==pygame.K_SPACE:
-                    while valid_position(Piece(cur.shape_key,cur.matrix_index,cur.x,cur.y+1),board):
-                        cur.y+=1
+                    cur.y += drop_distance(cur,board)
                     fall_t = spd
             elif e.type==pygame.KEYUP and e.key==pygame.K_DOWN: soft=False
 
         if fall_t>=spd:
             fall_t=0
-            mv=Piece(cur.shape_key,cur.matrix_index,cur.x,cur.y+1)
-            if valid_position(mv,board): cur.y+=1
+            if valid_position(cur.shape_key,cur.matrix_index,cur.x,cur.y+1,board): cur.y+=1
             else:
                 lock_piece(cur,board)
+                full_redraw=True
                 cleared=clear_lines(board)
                 if cleared:
                     lines+=cleared
                     base={1:100,2:300,3:500,4:800}
                     score+=base.get(cleared,1200)*(level+1)
+                    level = calc_level(lines)  # level and speed only change on a clear
+                    spd_base = fall_speed(level)
                 cur,nxt = nxt,spawn(bag)
-                if not valid_position(cur,board): running=False
-
-        screen.fill(BG_COLOR)
-        pf = pygame.Surface((GRID_WIDTH*BLOCK_SIZE, SCREEN_HEIGHT))
-        draw_board(pf,board); draw_piece(pf,cur)
-        screen.blit(pf,(0,0))
-        px = GRID_WIDTH*BLOCK_SIZE+12
-        render_text(screen,font_l,"ULTRA!TETRIS",(px,20))
-        render_text(screen,font_s,f"Score: {score}",(px,100))
-        render_text(screen,font_s,f"Lines: {lines}",(px,130))
-        render_text(screen,font_s,f"Level: {level}",(px,160))
-        render_text(screen,font_s,"Next:",(px,210))
-        ns = pygame.Surface((4*BLOCK_SIZE,4*BLOCK_SIZE))
-        draw_next(ns,nxt,BLOCK_SIZE//2,BLOCK_SIZE//2)
-        screen.blit(ns,(px,240))
-        if level>=MAX_LEVEL:
-            render_text(screen,font_s,"Level 29 — Killscreen!",(px,360))
-        pygame.display.flip()
+                if not valid_position(cur.shape_key,cur.matrix_index,cur.x,cur.y,board): running=False
+
+        # Present only what changed; locking a piece repaints the whole frame
+        piece_state = (cur.shape_key,cur.matrix_index,cur.x,cur.y)
+        panel_state = (score,lines,level,nxt.shape_key)
+        if full_redraw:
+            screen.fill(BG_COLOR)
+            draw_board(pf,board); draw_piece(pf,cur)
+            screen.blit(pf,(0,0))
+            draw_panel(screen,ns,font_l,font_s,score,lines,level,nxt)
+            pygame.display.flip()
+            full_redraw=False
+        else:
+            dirty=[]
+            if piece_state!=drawn_piece:
+                dirty += redraw_cells(pf,board,drawn_cells)
+                draw_piece(pf,cur)
+                dirty += cell_rects(piece_cells(cur))
+                screen.blits([(pf,r,r) for r in dirty], doreturn=False)
+            if panel_state!=drawn_panel:
+                dirty.append(draw_panel(screen,ns,font_l,font_s,score,lines,level,nxt))
+            update(dirty)
+        drawn_piece, drawn_panel, drawn_cells = piece_state, panel_state, piece_cells(cur)
 
     pygame.quit(); sys.exit()
 
@@ -16,29 +16,39 @@ SAVE_PATH = "save.json"
 WHITE, BLACK = (255,255,255), (0,0,0)
 GRAY, DARK = (55,55,55), (20,20,20)
 YELLOW, RED, GREEN, ORANGE, BLUE = (255,235,0), (220,60,60), (60,220,100), (255,165,0), (0,165,255)
+EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT]  # TEXTINPUT must stay allowed: SDL2 fills KEYDOWN.unicode from it
 
 # ────────────────────────────── Utils ──────────────────────────────
 def clamp(v,lo,hi): return max(lo,min(v,hi))
 def lerp(a,b,t): return a+(b-a)*t
-def now(): return time.perf_counter()
+_frame_t=time.perf_counter()  # stamped once per frame by Game.run; Timers read this
+def now(): return _frame_t
+_TEXT_CACHE={}; TEXT_CACHE_MAX=256  # (text,font,color) -> Surface, least recently used first
+def render_text(font,text,color):
+    k=(text,id(font),color); img=_TEXT_CACHE.pop(k,None)
+    if img is None:
+        if len(_TEXT_CACHE)>=TEXT_CACHE_MAX: del _TEXT_CACHE[next(iter(_TEXT_CACHE))]
+        img=font.render(text,True,color)
+    _TEXT_CACHE[k]=img  # pop+reinsert moves a hit to the recent end
+    return img
 def draw_text(surf,text,pos,font,color=WHITE,shadow=True,center=False):
-    if center:
-        r = font.render(text,True,color).get_rect(center=pos)
-        if shadow: surf.blit(font.render(text,True,BLACK),(r.x+1,r.y+1))
-        surf.blit(font.render(text,True,color),r); return
-    if shadow: surf.blit(font.render(text,True,BLACK),(pos[0]+1,pos[1]+1))
-    surf.blit(font.render(text,True,color),pos)
+    img=render_text(font,text,color)
+    if center: pos=img.get_rect(center=pos).topleft
+    if shadow: surf.blit(render_text(font,text,BLACK),(pos[0]+1,pos[1]+1))
+    surf.blit(img,pos)
 
 class Timer:
-    def __init__(self,d): self.d=d; self.t0=now()
+    __slots__=("d","t0")
+    def __init__(self,d): self.d=d; self.t0=_frame_t
     def reset(self,d=None): 
         if d: self.d=d
-        self.t0=now()
-    def done(self): return now()-self.t0>=self.d
-    def ratio(self): return clamp((now()-self.t0)/self.d,0,1)
+        self.t0=_frame_t
+    def done(self): return _frame_t-self.t0>=self.d
+    def ratio(self): return clamp((_frame_t-self.t0)/self.d,0,1)
 
 # ────────────────────────────── Framework ──────────────────────────────
 class BaseState: 
+    __slots__=("g",)
     def __init__(self,g): self.g=g
     def enter(self,**k): pass
     def exit(self): pass
@@ -51,6 +61,7 @@ class Game:
         pygame.init()
         self.screen=pygame.display.set_mode((WIDTH,HEIGHT))
         pygame.display.set_caption("Cat's PYGAME UT ENGINE 0.1")
+        pygame.event.set_blocked(None); pygame.event.set_allowed(EVENTS)
         self.clock=pygame.time.Clock()
         self.font=pygame.font.SysFont("consolas",18)
         self.big=pygame.font.SysFont("consolas",28,bold=True)
@@ -72,9 +83,10 @@ class Game:
             self.session=json.load(open(SAVE_PATH))
             self.switch("overworld")
     def run(self):
+        global _frame_t
         while True:
-            dt=self.clock.tick(FPS)/1000
-            for e in pygame.event.get():
+            dt=self.clock.tick(FPS)/1000; _frame_t=time.perf_counter()
+            for e in pygame.event.get(EVENTS):
                 if e.type==pygame.QUIT: pygame.quit(); sys.exit()
                 self.state.handle_event(e)
             self.state.update(dt)
@@ -83,6 +95,7 @@ class Game:
 
 # ────────────────────────────── Main Menu ──────────────────────────────
 class MainMenu(BaseState):
+    __slots__=("has_save","opts","idx","cool","fade","phase","flash","blink")
     def enter(self,**k):
         self.has_save=os.path.exists(SAVE_PATH)
         self.opts=["CONTINUE" if self.has_save else "NEW GAME","CREDITS","QUIT"]
@@ -115,6 +128,7 @@ class MainMenu(BaseState):
 
 # ────────────────────────────── Name Entry ──────────────────────────────
 class NameEntry(BaseState):
+    __slots__=("name",)
     def enter(self,**k): self.name=""
     def handle_event(self,e):
         if e.type==pygame.KEYDOWN:
@@ -134,10 +148,15 @@ ROOMS={"room_a":["####################","#........N.........#","#...............
                  "#....B.............#","#..................#","####################"]}
 
 class Overworld(BaseState):
+    __slots__=("map","w","h","tiles","bg","player")
     def enter(self,**k):
         self.map=ROOMS["room_a"]; self.w=len(self.map[0]); self.h=len(self.map)
+        self.tiles={(x,y):ch for y,row in enumerate(self.map) for x,ch in enumerate(row)}  # off-map reads as wall
+        self.bg=pygame.Surface((WIDTH,HEIGHT)).convert(); self.bg.fill(BLACK)  # room is static: bake it once
+        for (x,y),ch in self.tiles.items():
+            pygame.draw.rect(self.bg,GRAY if ch=="#" else DARK,(OX+x*TILE,OY+y*TILE,TILE,TILE))
         px,py=self.g.session["pos"]; self.player=pygame.Rect(OX+px*TILE,OY+py*TILE,TILE-8,TILE-8)
-    def tile(self,x,y): return self.map[y][x] if 0<=x<self.w and 0<=y<self.h else "#"
+    def tile(self,x,y): return self.tiles.get((x,y),"#")
     def handle_event(self,e):
         if e.type==pygame.KEYDOWN and e.key==pygame.K_ESCAPE: self.g.switch("menu")
     def update(self,dt):
@@ -146,17 +165,15 @@ class Overworld(BaseState):
         tx,ty=int((self.player.centerx-OX)//TILE),int((self.player.centery-OY)//TILE)
         if self.tile(tx,ty)=="B": self.g.push("battle",enemy=EnemyDummy())
     def draw(self,s):
-        s.fill(BLACK)
-        for y,row in enumerate(self.map):
-            for x,ch in enumerate(row):
-                col=GRAY if ch=="#" else DARK
-                pygame.draw.rect(s,col,(OX+x*TILE,OY+y*TILE,TILE,TILE))
+        s.blit(self.bg,(0,0))
         pygame.draw.rect(s,YELLOW,self.player)
 
 # ────────────────────────────── Battle (simplified) ──────────────────────────────
 class EnemyDummy:
+    __slots__=("name","hp","hpmax")
     def __init__(self): self.name="DUMMY"; self.hp=20; self.hpmax=20
 class Battle(BaseState):
+    __slots__=("e","t")
     def enter(self,**k): self.e=k.get("enemy",EnemyDummy()); self.t=Timer(1)
     def handle_event(self,e):
         if e.type==pygame.KEYDOWN and e.key==pygame.K_RETURN: self.g.pop()
@@ -168,6 +185,7 @@ class Battle(BaseState):
 
 # ────────────────────────────── Credits ──────────────────────────────
 class Credits(BaseState):
+    __slots__=("scroll",)
     def enter(self,**k): self.scroll=HEIGHT
     def handle_event(self,e):
         if e.type==pygame.KEYDOWN: self.g.switch("menu")
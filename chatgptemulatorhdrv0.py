@@ -1,11 +1,17 @@
 # chip8.py — single-file educational CHIP‑8 interpreter (pygame)
 # MIT License. No external assets. ~60 Hz timers, 64x32 display, 16-key hex keypad.
 # Run: python chip8.py path/to/rom.ch8
-import sys, time, random, pygame
+import sys, random, pygame, numpy as np
 from pathlib import Path
 
 # ── CHIP‑8 core ────────────────────────────────────────────────────────────────────
+SPRITE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)  # byte → 8 pixels, MSB first
+SPRITE_COLS = np.arange(8)
+SPRITE_ROWS = np.arange(16)
+
 class Chip8:
+    __slots__ = ("mem","V","I","pc","sp","stack","delay","sound","keys","draw_flag","w","h","gfx")
+
     def __init__(self):
         self.mem = bytearray(4096)
         self.V = [0]*16              # V0..VF
@@ -15,10 +21,10 @@ class Chip8:
         self.stack = [0]*16
         self.delay = 0               # delay timer (60 Hz)
         self.sound = 0               # sound timer (60 Hz)
-        self.keys = [0]*16           # keypad state
+        self.keys = np.zeros(16, np.uint8)  # keypad state
         self.draw_flag = False
         self.w, self.h = 64, 32
-        self.gfx = [[0]*self.w for _ in range(self.h)]
+        self.gfx = np.zeros((self.h, self.w), np.uint8)
         # COSMAC VIP font (each 5 bytes)
         font = [
             0xF0,0x90,0x90,0x90,0xF0, 0x20,0x60,0x20,0x20,0x70,
@@ -36,91 +42,108 @@ class Chip8:
         self.mem[0x200:0x200+len(rom_bytes)] = rom_bytes
 
     def clear(self):
-        for y in range(self.h):
-            for x in range(self.w):
-                self.gfx[y][x] = 0
+        self.gfx.fill(0)
         self.draw_flag = True
 
-    def fetch(self):
-        op = (self.mem[self.pc] << 8) | self.mem[self.pc+1]
-        self.pc += 2
-        return op
-
     def step(self):
-        op = self.fetch()
-        nnn, kk = op & 0x0FFF, op & 0x00FF
-        n, x, y = op & 0x000F, (op>>8)&0xF, (op>>4)&0xF
-        top = op & 0xF000
+        mem, pc = self.mem, self.pc
+        op = (mem[pc] << 8) | mem[pc+1]
+        self.pc = pc + 2
+        OPS[op >> 12](self, op)
 
+    # ── opcode handlers: one per top nibble, 8XYN / FXKK fan out through ALU_OPS / F_OPS ──
+    def op_0(self, op):
         if op == 0x00E0: self.clear()
         elif op == 0x00EE: self.sp-=1; self.pc = self.stack[self.sp]
-        elif top == 0x0000: pass  # 0NNN ignored
-        elif top == 0x1000: self.pc = nnn
-        elif top == 0x2000: self.stack[self.sp]=self.pc; self.sp+=1; self.pc=nnn
-        elif top == 0x3000: 
-            if self.V[x]==kk: self.pc+=2
-        elif top == 0x4000: 
-            if self.V[x]!=kk: self.pc+=2
-        elif top == 0x5000 and n==0x0:
-            if self.V[x]==self.V[y]: self.pc+=2
-        elif top == 0x6000: self.V[x]=kk
-        elif top == 0x7000: self.V[x]=(self.V[x]+kk)&0xFF
-        elif top == 0x8000:
-            if   n==0x0: self.V[x]=self.V[y]
-            elif n==0x1: self.V[x]|=self.V[y]
-            elif n==0x2: self.V[x]&=self.V[y]
-            elif n==0x3: self.V[x]^=self.V[y]
-            elif n==0x4:
-                s=self.V[x]+self.V[y]; self.V[0xF]=1 if s>0xFF else 0; self.V[x]=s&0xFF
-            elif n==0x5:
-                self.V[0xF]=1 if self.V[x]>self.V[y] else 0; self.V[x]=(self.V[x]-self.V[y])&0xFF
-            elif n==0x6:
-                self.V[0xF]=self.V[x]&1; self.V[x]=(self.V[x]>>1)&0xFF
-            elif n==0x7:
-                self.V[0xF]=1 if self.V[y]>self.V[x] else 0; self.V[x]=(self.V[y]-self.V[x])&0xFF
-            elif n==0xE:
-                self.V[0xF]=(self.V[x]>>7)&1; self.V[x]=(self.V[x]<<1)&0xFF
-        elif top == 0x9000 and n==0x0:
-            if self.V[x]!=self.V[y]: self.pc+=2
-        elif top == 0xA000: self.I = nnn
-        elif top == 0xB000: self.pc = nnn + self.V[0]
-        elif top == 0xC000: self.V[x] = random.randint(0,255) & kk
-        elif top == 0xD000:
-            vx, vy, height = self.V[x]%64, self.V[y]%32, n
-            self.V[0xF]=0
-            for row in range(height):
-                sprite = self.mem[self.I+row]
-                py = (vy+row)%32
-                for col in range(8):
-                    if sprite & (0x80>>col):
-                        px = (vx+col)%64
-                        if self.gfx[py][px]==1: self.V[0xF]=1
-                        self.gfx[py][px]^=1
-            self.draw_flag=True
-        elif top == 0xE000:
-            if kk==0x9E and self.keys[self.V[x]&0xF]: self.pc+=2
-            if kk==0xA1 and not self.keys[self.V[x]&0xF]: self.pc+=2
-        elif top == 0xF000:
-            if   kk==0x07: self.V[x]=self.delay
-            elif kk==0x0A:
-                # wait for key
-                for i,k in enumerate(self.keys):
-                    if k: self.V[x]=i; break
-                else:
-                    self.pc-=2  # repeat this op until keypress
-            elif kk==0x15: self.delay=self.V[x]
-            elif kk==0x18: self.sound=self.V[x]
-            elif kk==0x1E: self.I=(self.I+self.V[x])&0xFFF
-            elif kk==0x29: self.I=0x50 + (self.V[x]&0xF)*5
-            elif kk==0x33:
-                v=self.V[x]; self.mem[self.I]=v//100; self.mem[self.I+1]=(v//10)%10; self.mem[self.I+2]=v%10
-            elif kk==0x55:
-                for i in range(x+1): self.mem[self.I+i]=self.V[i]
-            elif kk==0x65:
-                for i in range(x+1): self.V[i]=self.mem[self.I+i]
-            else: pass
-        else:
-            pass
+        # 0NNN ignored
+    def op_1(self, op): self.pc = op & 0xFFF
+    def op_2(self, op): self.stack[self.sp]=self.pc; self.sp+=1; self.pc=op & 0xFFF
+    def op_3(self, op):
+        if self.V[(op>>8)&0xF]==op&0xFF: self.pc+=2
+    def op_4(self, op):
+        if self.V[(op>>8)&0xF]!=op&0xFF: self.pc+=2
+    def op_5(self, op):
+        if op&0xF==0 and self.V[(op>>8)&0xF]==self.V[(op>>4)&0xF]: self.pc+=2
+    def op_6(self, op): self.V[(op>>8)&0xF]=op&0xFF
+    def op_7(self, op):
+        x=(op>>8)&0xF; self.V[x]=(self.V[x]+(op&0xFF))&0xFF
+    def op_8(self, op):
+        f = ALU_OPS.get(op&0xF)
+        if f: f(self.V, (op>>8)&0xF, (op>>4)&0xF)
+    def op_9(self, op):
+        if op&0xF==0 and self.V[(op>>8)&0xF]!=self.V[(op>>4)&0xF]: self.pc+=2
+    def op_a(self, op): self.I = op & 0xFFF
+    def op_b(self, op): self.pc = (op & 0xFFF) + self.V[0]
+    def op_c(self, op): self.V[(op>>8)&0xF] = random.randint(0,255) & op & 0xFF
+    def op_d(self, op):
+        n = op & 0xF
+        vx, vy = self.V[(op>>8)&0xF]%64, self.V[(op>>4)&0xF]%32
+        sprite = SPRITE_BITS[np.frombuffer(self.mem, np.uint8, n, self.I)]
+        cells = np.ix_((vy+SPRITE_ROWS[:n])%32, (vx+SPRITE_COLS)%64)
+        old = self.gfx[cells]
+        self.V[0xF] = 1 if (old & sprite).any() else 0
+        self.gfx[cells] = old ^ sprite
+        self.draw_flag=True
+    def op_e(self, op):
+        kk, pressed = op&0xFF, self.keys[self.V[(op>>8)&0xF]&0xF]
+        if kk==0x9E and pressed: self.pc+=2
+        if kk==0xA1 and not pressed: self.pc+=2
+    def op_f(self, op):
+        f = F_OPS.get(op&0xFF)
+        if f: f(self, (op>>8)&0xF)
+
+    # 8XYN: ALU ops on the registers
+    @staticmethod
+    def op_8xy0(V, x, y): V[x]=V[y]
+    @staticmethod
+    def op_8xy1(V, x, y): V[x]|=V[y]
+    @staticmethod
+    def op_8xy2(V, x, y): V[x]&=V[y]
+    @staticmethod
+    def op_8xy3(V, x, y): V[x]^=V[y]
+    @staticmethod
+    def op_8xy4(V, x, y):
+        s=V[x]+V[y]; V[0xF]=1 if s>0xFF else 0; V[x]=s&0xFF
+    @staticmethod
+    def op_8xy5(V, x, y):
+        V[0xF]=1 if V[x]>V[y] else 0; V[x]=(V[x]-V[y])&0xFF
+    @staticmethod
+    def op_8xy6(V, x, y):
+        V[0xF]=V[x]&1; V[x]=(V[x]>>1)&0xFF
+    @staticmethod
+    def op_8xy7(V, x, y):
+        V[0xF]=1 if V[y]>V[x] else 0; V[x]=(V[y]-V[x])&0xFF
+    @staticmethod
+    def op_8xye(V, x, y):
+        V[0xF]=(V[x]>>7)&1; V[x]=(V[x]<<1)&0xFF
+
+    # FXKK: timers, keypad, index and memory
+    def op_fx07(self, x): self.V[x]=self.delay
+    def op_fx0a(self, x):
+        # wait for key (lowest pressed one wins)
+        if self.keys.any(): self.V[x]=int(self.keys.argmax())
+        else: self.pc-=2  # repeat this op until keypress
+    def op_fx15(self, x): self.delay=self.V[x]
+    def op_fx18(self, x): self.sound=self.V[x]
+    def op_fx1e(self, x): self.I=(self.I+self.V[x])&0xFFF
+    def op_fx29(self, x): self.I=0x50 + (self.V[x]&0xF)*5
+    def op_fx33(self, x):
+        v=self.V[x]; self.mem[self.I]=v//100; self.mem[self.I+1]=(v//10)%10; self.mem[self.I+2]=v%10
+    def op_fx55(self, x):
+        for i in range(x+1): self.mem[self.I+i]=self.V[i]
+    def op_fx65(self, x):
+        for i in range(x+1): self.V[i]=self.mem[self.I+i]
+
+    def run(self, cycles):
+        # one frame's batch of ops; the bound method is looked up once, not per op
+        step = self.step
+        for _ in range(cycles):
+            step()
+
+# dispatch tables (unknown sub-opcodes are no-ops, as before)
+OPS = tuple(getattr(Chip8, f"op_{i:x}") for i in range(16))
+ALU_OPS = {n: getattr(Chip8, f"op_8xy{n:x}") for n in (0x0,0x1,0x2,0x3,0x4,0x5,0x6,0x7,0xE)}
+F_OPS = {kk: getattr(Chip8, f"op_fx{kk:02x}") for kk in (0x07,0x0A,0x15,0x18,0x1E,0x29,0x33,0x55,0x65)}
 
 # ── Pygame front-end ───────────────────────────────────────────────────────────────
 KEYMAP = {
@@ -129,6 +152,8 @@ KEYMAP = {
     pygame.K_s:0x8, pygame.K_d:0x9, pygame.K_z:0xA, pygame.K_c:0xB,
     pygame.K_4:0xC, pygame.K_r:0xD, pygame.K_f:0xE, pygame.K_v:0xF
 }
+KEY_CODES = tuple(sorted(KEYMAP, key=KEYMAP.get))  # pygame key for CHIP‑8 key 0x0..0xF
+EVENTS = [pygame.QUIT, pygame.KEYDOWN]  # everything else is blocked at the SDL queue
 
 def main():
     if len(sys.argv)<2:
@@ -139,53 +164,50 @@ def main():
     pygame.init()
     scale = 16  # 64*16 x 32*16 → desktop-friendly
     screen = pygame.display.set_mode((64*scale, 32*scale))
-    pygame.display.set_caption("CHIP‑8 (pygame) — ↑/↓ to change speed, R to reset")
+    title = "CHIP‑8 (pygame) — ↑/↓ to change speed, R to reset"
+    pygame.display.set_caption(title)
+    pygame.event.set_blocked(None); pygame.event.set_allowed(EVENTS)
     clock = pygame.time.Clock()
+    # the 64x32 framebuffer is drawn 1:1 here, then SDL scales it up into the window
+    small = pygame.Surface((64, 32)).convert()
+    palette = np.array([small.map_rgb((0,0,0)), small.map_rgb((255,255,255))], np.uint32)
 
     cycles_per_frame = 10  # rough; interpreter is simple, so keep small & stable
-    last_timer_tick = time.perf_counter()
+    timer_ticks = 1  # 60 Hz timer steps owed this frame (more than one after a dropped frame)
 
     running=True
     while running:
         # input
-        for ev in pygame.event.get():
+        for ev in pygame.event.get(EVENTS):
             if ev.type == pygame.QUIT: running=False
-            elif ev.type == pygame.KEYDOWN:
-                if ev.key in KEYMAP: chip.keys[KEYMAP[ev.key]]=1
-                elif ev.key == pygame.K_ESCAPE: running=False
+            elif ev.type == pygame.KEYDOWN and ev.key not in KEYMAP:  # keypad is sampled below
+                if   ev.key == pygame.K_ESCAPE: running=False
                 elif ev.key == pygame.K_r:      chip.__init__(); chip.load(rom)
                 elif ev.key == pygame.K_UP:     cycles_per_frame=min(40, cycles_per_frame+1)
                 elif ev.key == pygame.K_DOWN:   cycles_per_frame=max(1,  cycles_per_frame-1)
-            elif ev.type == pygame.KEYUP:
-                if ev.key in KEYMAP: chip.keys[KEYMAP[ev.key]]=0
+        pressed = pygame.key.get_pressed()
+        chip.keys[:] = [pressed[k] for k in KEY_CODES]
 
         # execute a small, steady batch of ops per frame
-        for _ in range(cycles_per_frame):
-            chip.step()
+        chip.run(cycles_per_frame)
 
         # 60 Hz timers
-        now = time.perf_counter()
-        while now - last_timer_tick >= 1/60:
-            last_timer_tick += 1/60
-            if chip.delay>0: chip.delay-=1
-            if chip.sound>0: chip.sound-=1
+        if chip.delay>0: chip.delay=max(0, chip.delay-timer_ticks)
+        if chip.sound>0: chip.sound=max(0, chip.sound-timer_ticks)
 
         # draw
         if chip.draw_flag:
             chip.draw_flag=False
-            for y in range(chip.h):
-                for x in range(chip.w):
-                    c = 255 if chip.gfx[y][x] else 0
-                    pygame.draw.rect(screen, (c,c,c), (x*scale, y*scale, scale, scale))
+            pygame.surfarray.blit_array(small, palette[chip.gfx.T])
+            pygame.transform.scale(small, screen.get_size(), screen)
             pygame.display.flip()
 
-        # simple “beep” via title (no audio lib)
-        if chip.sound>0:
-            pygame.display.set_caption("CHIP‑8 (BEEP!)")
-        else:
-            pygame.display.set_caption("CHIP‑8 (pygame) — ↑/↓ speed, R reset")
+        # simple “beep” via title (no audio lib); only touch the window when it changes
+        new_title = "CHIP‑8 (BEEP!)" if chip.sound>0 else "CHIP‑8 (pygame) — ↑/↓ speed, R reset"
+        if new_title != title:
+            title = new_title; pygame.display.set_caption(title)
 
-        clock.tick(60)  # aim for ~60 FPS
+        timer_ticks = max(1, round(clock.tick(60) * 60 / 1000))  # aim for ~60 FPS
 
     pygame.quit()
 
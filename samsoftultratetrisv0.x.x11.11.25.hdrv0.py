@@ -37,6 +37,7 @@ BLOCK_COLOR = (139,172,15)
 TEXT_COLOR = (155,188,15)
 OUTLINE_COLOR = (5,30,5)
 COLORS = [BG_COLOR, BLOCK_COLOR]
+EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.USEREVENT, pygame.USEREVENT + 1]  # music/SFX timers ride on USEREVENT
 
 SHAPES = {
     'I': [[1,1,1,1]], 'O': [[1,1],[1,1]], 'T': [[1,1,1],[0,1,0]],
@@ -44,6 +45,18 @@ SHAPES = {
     'J': [[1,0,0],[1,1,1]], 'L': [[0,0,1],[1,1,1]],
 }
 
+def _rotations(rows):
+    # distinct clockwise rotations of a shape: 1 for O, 2 for I/S/Z, 4 for T/J/L
+    first = np.array(rows, np.uint8); first.setflags(write=False)
+    rots = [first]
+    while True:
+        nxt = np.ascontiguousarray(np.rot90(rots[-1], -1)); nxt.setflags(write=False)
+        if np.array_equal(nxt, first): return rots
+        rots.append(nxt)
+
+ROTATIONS = {k: _rotations(v) for k, v in SHAPES.items()}
+SHAPE_KEYS = tuple(SHAPES)
+
 # FULL Game Boy DMG frequency table
 GB_FREQS = {
     'C3': 130.81, 'G3': 196.00, 'A3': 220.00,
@@ -73,23 +86,31 @@ GB_SFX = {
     'tetris': [('C6', 0.08), ('E6', 0.08), ('G6', 0.08), ('C7', 0.35)],
 }
 
+_TEXT_CACHE = {}  # (text, size, color) → rendered Surface
+TEXT_CACHE_MAX = 256
+_FONTS = {}  # size → bold monospace SysFont
+
 current_note = 0
 music_enabled = False
 audio_initialized = False
 sfx_queue = []  # For non-blocking sequenced SFX
+SOUND_CACHE = {}  # (note name, duration) → Sound, synthesized once the real mixer is up
 
 # ───────── CLASSES ─────────
-@dataclass
+@dataclass(slots=True)
 class Piece:
-    x:int; y:int; shape:list; color:int
-    def rotate(self): self.shape = [list(r) for r in zip(*self.shape[::-1])]
+    x:int; y:int; shape:np.ndarray; color:int; kind:str; rot:int = 0
+    def rotate(self):  # clockwise
+        rots = ROTATIONS[self.kind]
+        self.rot = (self.rot + 1) % len(rots)
+        self.shape = rots[self.rot]
 
 # ───────── GAME LOGIC ─────────
 class Tetris:
     def __init__(self):
-        self.grid = [[0]*GRID_W for _ in range(GRID_H)]
+        self.grid = np.zeros((GRID_H, GRID_W), np.uint8)
         self.score = self.level = self.lines = 0
-        self.bag = list(SHAPES.keys())
+        self.bag = []  # refilled by new_piece
         self.current = self.new_piece()
         self.next = self.new_piece()
         self.fall_speed = GRAVITY[self.level]
@@ -97,28 +118,27 @@ class Tetris:
         self.has_dropped_first_piece = False
         
     def new_piece(self):
-        if not self.bag: self.bag = list(SHAPES.keys())
-        k = self.bag.pop(random.randrange(len(self.bag)))
-        shape = [r[:] for r in SHAPES[k]]
-        return Piece(GRID_W//2 - len(shape[0])//2, 0, shape, 1)
+        if not self.bag:
+            self.bag = list(SHAPE_KEYS)
+            random.shuffle(self.bag)
+        k = self.bag.pop()
+        shape = ROTATIONS[k][0]
+        return Piece(GRID_W//2 - shape.shape[1]//2, 0, shape, 1, k)
     
     def valid(self, shape, ox, oy):
-        for y, row in enumerate(shape):
-            for x, c in enumerate(row):
-                if c:
-                    nx, ny = ox + x, oy + y
-                    if nx < 0 or nx >= GRID_W or ny >= GRID_H: return False
-                    if ny >= 0 and self.grid[ny][nx]: return False
-        return True
+        # every row and column of a tetromino has a block, so bounds are checked on the box
+        h, w = shape.shape
+        if ox < 0 or ox + w > GRID_W or oy + h > GRID_H: return False
+        top = max(0, -oy)  # rows above the field can't collide
+        return not (self.grid[oy+top:oy+h, ox:ox+w] & shape[top:]).any()
     
     def lock(self):
-        for y, row in enumerate(self.current.shape):
-            for x, c in enumerate(row):
-                if c:
-                    if self.current.y + y < 0:
-                        self.gameover = True
-                        return
-                    self.grid[self.current.y + y][self.current.x + x] = 1
+        p = self.current
+        if p.y < 0:
+            self.gameover = True
+            return
+        h, w = p.shape.shape
+        self.grid[p.y:p.y+h, p.x:p.x+w] |= p.shape
         
         lines_cleared = self.clear_lines()
         
@@ -133,13 +153,12 @@ class Tetris:
         self.fall_speed = GRAVITY[min(self.level, 29)]
     
     def clear_lines(self):
-        new = [r for r in self.grid if any(c == 0 for c in r)]
-        cleared = GRID_H - len(new)
+        full = self.grid.all(axis=1)
+        cleared = int(full.sum())
         self.lines += cleared
         self.score += [0, 40, 100, 300, 1200][cleared] * (self.level + 1)
-        while len(new) < GRID_H:
-            new.insert(0, [0] * GRID_W)
-        self.grid = new
+        if cleared:
+            self.grid = np.vstack((np.zeros((cleared, GRID_W), np.uint8), self.grid[~full]))
         if self.lines >= (self.level + 1) * 10:
             self.level = min(self.level + 1, 29)
         return cleared
@@ -150,10 +169,11 @@ class Tetris:
             queue_sfx('move')
     
     def rotate_piece(self):
-        old = [r[:] for r in self.current.shape]
-        self.current.rotate()
-        if not self.valid(self.current.shape, self.current.x, self.current.y):
-            self.current.shape = old
+        p = self.current
+        old = p.rot, p.shape
+        p.rotate()
+        if not self.valid(p.shape, p.x, p.y):
+            p.rot, p.shape = old
         else:
             queue_sfx('rotate')
     
@@ -173,29 +193,49 @@ class Tetris:
         self.lock()
 
 # ───────── DRAW ─────────
-def draw_grid(s, grid):
-    for y in range(GRID_H):
-        for x in range(GRID_W):
-            if grid[y][x]:
-                r = pygame.Rect(x*BLOCK, y*BLOCK, BLOCK, BLOCK)
-                pygame.draw.rect(s, COLORS[1], r)
-                pygame.draw.rect(s, OUTLINE_COLOR, r, 2)
+# Pre-rendered tiles, built by build_surfaces() once the display exists
+BLOCK_SURF = CELL_SURF = GRID_SURF = None
+
+def build_surfaces():
+    global BLOCK_SURF, CELL_SURF, GRID_SURF
+    BLOCK_SURF = pygame.Surface((BLOCK, BLOCK)).convert()
+    BLOCK_SURF.fill(COLORS[1])
+    pygame.draw.rect(BLOCK_SURF, OUTLINE_COLOR, BLOCK_SURF.get_rect(), 2)
+    # Locked cells sit under the grid lines, which cover their top row and left column
+    CELL_SURF = BLOCK_SURF.copy()
+    pygame.draw.line(CELL_SURF, GRID_LINE_COLOR, (0, 0), (BLOCK - 1, 0))
+    pygame.draw.line(CELL_SURF, GRID_LINE_COLOR, (0, 0), (0, BLOCK - 1))
+    GRID_SURF = pygame.Surface((GRID_W*BLOCK + 1, GRID_H*BLOCK)).convert()
+    GRID_SURF.fill(BG_COLOR)
     for x in range(GRID_W + 1):
-        pygame.draw.line(s, GRID_LINE_COLOR, (x*BLOCK, 0), (x*BLOCK, GRID_H*BLOCK))
+        pygame.draw.line(GRID_SURF, GRID_LINE_COLOR, (x*BLOCK, 0), (x*BLOCK, GRID_H*BLOCK))
     for y in range(GRID_H + 1):
-        pygame.draw.line(s, GRID_LINE_COLOR, (0, y*BLOCK), (GRID_W*BLOCK, y*BLOCK))
+        pygame.draw.line(GRID_SURF, GRID_LINE_COLOR, (0, y*BLOCK), (GRID_W*BLOCK, y*BLOCK))
+
+def draw_grid(s, grid):
+    s.blit(GRID_SURF, (0, 0))
+    ys, xs = np.nonzero(grid)
+    s.blits([(CELL_SURF, (x*BLOCK, y*BLOCK)) for y, x in zip(ys.tolist(), xs.tolist())], doreturn=False)
 
 def draw_piece(s, p, ox, oy):
-    for py, row in enumerate(p.shape):
-        for px, c in enumerate(row):
-            if c:
-                r = pygame.Rect((p.x + px + ox)*BLOCK, (p.y + py + oy)*BLOCK, BLOCK, BLOCK)
-                pygame.draw.rect(s, COLORS[p.color], r)
-                pygame.draw.rect(s, OUTLINE_COLOR, r, 2)
+    ys, xs = np.nonzero(p.shape)
+    s.blits([(BLOCK_SURF, ((p.x + x + ox)*BLOCK, (p.y + y + oy)*BLOCK))
+             for y, x in zip(ys.tolist(), xs.tolist())], doreturn=False)
+
+def font(sz):
+    f = _FONTS.get(sz)
+    if f is None:
+        f = _FONTS[sz] = pygame.font.SysFont("monospace", sz, bold=True)
+    return f
 
 def draw_text(s, t, sz, x, y, c=TEXT_COLOR):
-    f = pygame.font.SysFont("monospace", sz, bold=True)
-    s.blit(f.render(t, True, c), (x, y))
+    key = (t, sz, c)
+    img = _TEXT_CACHE.pop(key, None)
+    if img is None:
+        if len(_TEXT_CACHE) >= TEXT_CACHE_MAX: del _TEXT_CACHE[next(iter(_TEXT_CACHE))]  # LRU entry sits first
+        img = font(sz).render(t, True, c)
+    _TEXT_CACHE[key] = img  # Re-inserting a hit marks it most recently used
+    s.blit(img, (x, y))
 
 # ───────── AUDIO RESURRECTION (FIXED) ─────────
 def resurrect_audio():
@@ -214,20 +254,36 @@ def resurrect_audio():
     pygame.mixer.quit()
     pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=256)
     
+    # Every note the melody and SFX can play, synthesized once
+    notes = set(zip(MELODY_NOTES, MELODY_DURS))
+    for data in GB_SFX.values():
+        notes.update([data] if isinstance(data, tuple) else data)
+    for name, dur in notes:
+        SOUND_CACHE[name, dur] = generate_gb_wave(GB_FREQS[name], dur)
+    
     audio_initialized = True
     music_enabled = True
     schedule_next_note()  # Kick off music immediately
 
 def generate_gb_wave(freq, duration, wave_type="square"):
     sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False)
+    n = int(sample_rate * duration)
+    phase = np.arange(n, dtype=np.float32) * np.float32(freq / sample_rate)
+    phase -= np.floor(phase)  # position within the cycle, 0..1
+    pad = np.zeros(n + 4, np.float32)  # the wave is built in place, two zero samples each side
+    wave = pad[2:-2]
     if wave_type == "square":
-        wave = np.sign(np.sin(2 * np.pi * freq * t))
+        wave.fill(-1)
+        wave[phase < 0.5] = 1
     else:
-        wave = np.sin(2 * np.pi * freq * t)
-    wave = np.convolve(wave, [0.1, 0.2, 0.4, 0.2, 0.1], mode='same')
-    wave = (wave * 32767 * 0.25).astype(np.int16)
-    return pygame.sndarray.make_sound(np.column_stack((wave, wave)))
+        np.sin(2 * np.pi * phase, out=wave)
+    # symmetric 5-tap [0.1, 0.2, 0.4, 0.2, 0.1] smoothing, folded to three multiplies
+    out = 0.4 * wave
+    out += 0.2 * (pad[1:-3] + pad[3:-1])
+    out += 0.1 * (pad[:-4] + pad[4:])
+    out *= 32767 * 0.25
+    wave = out.astype(np.int16)
+    return pygame.sndarray.make_sound(np.repeat(wave[:, None], 2, axis=1))
 
 def queue_sfx(sfx_name):
     if not audio_initialized:
@@ -243,10 +299,10 @@ def process_sfx_queue():
         return
     note = sfx_queue[0][0]
     freq_name, dur = note
-    generate_gb_wave(GB_FREQS[freq_name], dur).play()
+    SOUND_CACHE[note].play()
     if len(sfx_queue[0]) > 1:
         sfx_queue[0].pop(0)
-        pygame.time.set_timer(pygame.USEREVENT + 1, int(dur * 1000))  # Chain next note
+        pygame.time.set_timer(pygame.USEREVENT + 1, int(dur * 1000), loops=1)  # Chain next note
     else:
         sfx_queue.pop(0)
 
@@ -255,13 +311,16 @@ def schedule_next_note():
         return
     duration = MELODY_DURS[current_note]
     note_name = MELODY_NOTES[current_note]
-    generate_gb_wave(GB_FREQS[note_name], duration).play()
-    pygame.time.set_timer(pygame.USEREVENT, int(duration * 1000))
+    SOUND_CACHE[note_name, duration].play()
+    pygame.time.set_timer(pygame.USEREVENT, int(duration * 1000), loops=1)
 
 # ───────── MENU (MUTED) ─────────
 def main():
     screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
     pygame.display.set_caption("ULTRA!TETRIS — Game Boy Edition")
+    pygame.event.set_blocked(None); pygame.event.set_allowed(EVENTS)
+    build_surfaces()
+    for sz in (48, 28, 24, 20, 18, 16): font(sz)  # every size the menu, HUD and game-over screen use
     clock = pygame.time.Clock()
 
     while True:
@@ -271,7 +330,7 @@ def main():
         draw_text(screen, "AUDIO: MUTED IN MENU", 18, 130, 320)
         pygame.display.flip()
 
-        for e in pygame.event.get():
+        for e in pygame.event.get(EVENTS):
             if e.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
@@ -282,11 +341,13 @@ def main():
 def game_loop(screen, clock):
     global current_note
     current_note = 0
+    if audio_initialized:
+        schedule_next_note()  # The one-shot chain lapsed in the menu; restart it
     g = Tetris()
     fall = 0
 
     while True:
-        for e in pygame.event.get():
+        for e in pygame.event.get(EVENTS):
             if e.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             if e.type == pygame.KEYDOWN:
@@ -300,8 +361,7 @@ def game_loop(screen, clock):
                 current_note = (current_note + 1) % len(MELODY_NOTES)
                 schedule_next_note()
             if e.type == pygame.USEREVENT + 1 and audio_initialized:
-                pygame.time.set_timer(pygame.USEREVENT + 1, 0)  # Clear
-                process_sfx_queue()
+                process_sfx_queue()  # one-shot timer, nothing to clear
 
         fall += 1
         if fall >= g.fall_speed:
@@ -81,7 +81,7 @@ class Player(pygame.sprite.Sprite):
         if self.on_ground:
             self.vel_y = PLAYER_JUMP_STRENGTH
 
-    def update(self, platforms):
+    def update(self, query_platforms):
         # Gravity
         self.vel_y += GRAVITY
         if self.vel_y > 20:
@@ -89,15 +89,15 @@ class Player(pygame.sprite.Sprite):
 
         # Horizontal movement
         self.rect.x += self.vel_x
-        self.check_collisions(platforms, "horizontal")
+        self.check_collisions(query_platforms, "horizontal")
 
         # Vertical movement
         self.rect.y += self.vel_y
         self.on_ground = False
-        self.check_collisions(platforms, "vertical")
+        self.check_collisions(query_platforms, "vertical")
 
-    def check_collisions(self, platforms, direction):
-        for platform in platforms:
+    def check_collisions(self, query_platforms, direction):
+        for platform in query_platforms(self.rect):
             if self.rect.colliderect(platform.rect):
                 if direction == "horizontal":
                     if self.vel_x > 0:
@@ -125,7 +125,7 @@ class Enemy(pygame.sprite.Sprite):
         self.patrol_distance = 100
         self.vel_y = 0
 
-    def update(self, platforms):
+    def update(self, query_platforms):
         self.rect.x += self.vel_x
         if abs(self.rect.x - self.start_x) > self.patrol_distance:
             self.vel_x *= -1
@@ -135,7 +135,7 @@ class Enemy(pygame.sprite.Sprite):
         self.rect.y += self.vel_y
 
         # Simple ground collision
-        for platform in platforms:
+        for platform in query_platforms(self.rect):
             if self.rect.colliderect(platform.rect):
                 if self.vel_y > 0:
                     self.rect.bottom = platform.rect.top
@@ -166,9 +166,11 @@ class Game:
         self.current_level_index = 0
         self.scroll = 0
         self.level_width = 0
+        self.static_bg = None
 
         self.all_sprites = pygame.sprite.Group()
         self.platforms = pygame.sprite.Group()
+        self.platform_rows = {}  # tile_y -> ([rects], [platforms]) in column order
         self.enemies = pygame.sprite.Group()
         self.player = None
         self.flag_rect = None
@@ -178,11 +180,18 @@ class Game:
     def load_level(self, level_index):
         self.all_sprites.empty()
         self.platforms.empty()
+        self.platform_rows = {}
         self.enemies.empty()
 
         self.scroll = 0
         layout = LEVELS[level_index]
         self.level_width = len(layout[0]) * TILE_SIZE
+        # Platforms never move, so they are baked into one sky-filled surface here
+        # and drawn as a single blit. Rows can run past level_width and the
+        # camera can overshoot it, so pad by a screen of sky.
+        bg_width = max(len(row) for row in layout) * TILE_SIZE + SCREEN_WIDTH
+        self.static_bg = pygame.Surface((bg_width, SCREEN_HEIGHT)).convert()
+        self.static_bg.fill(SKY_BLUE)
 
         for y, row in enumerate(layout):
             for x, tile in enumerate(row):
@@ -193,7 +202,10 @@ class Game:
                 elif tile in ["X", "-", "?"]:
                     platform = Platform(world_x, world_y, tile)
                     self.platforms.add(platform)
-                    self.all_sprites.add(platform)
+                    self.static_bg.blit(platform.image, platform.rect)
+                    rects, platforms = self.platform_rows.setdefault(y, ([], []))
+                    rects.append(platform.rect)
+                    platforms.append(platform)
                 elif tile == "G":
                     enemy = Enemy(world_x, world_y)
                     self.enemies.add(enemy)
@@ -206,6 +218,25 @@ class Game:
             self.player = Player(100, SCREEN_HEIGHT - 200)
             self.all_sprites.add(self.player)
 
+    def query_platforms(self, rect):
+        # Broad phase: only the tile rows rect spans. Narrow phase: Rect.collidelist
+        # scans a row's rects in C. Yields colliding platforms in level (row-major)
+        # order and re-reads rect after every yield, so a push-out during
+        # resolution meets the same platforms, in the same order, as a scan over
+        # every platform would.
+        rows = self.platform_rows
+        ty = rect.top // TILE_SIZE
+        while ty <= (rect.bottom - 1) // TILE_SIZE:
+            row = rows.get(ty)
+            if row:
+                rects, platforms = row
+                i = rect.collidelist(rects)
+                while i >= 0:
+                    yield platforms[i]
+                    j = rect.collidelist(rects[i + 1:])
+                    i = i + 1 + j if j >= 0 else -1
+            ty += 1
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -222,9 +253,9 @@ class Game:
             self.player.vel_x = PLAYER_SPEED
 
     def update(self):
-        self.player.update(self.platforms)
+        self.player.update(self.query_platforms)
         for enemy in self.enemies:
-            enemy.update(self.platforms)
+            enemy.update(self.query_platforms)
             if self.player.rect.colliderect(enemy.rect):
                 if self.player.vel_y > 0 and self.player.rect.bottom < enemy.rect.centery:
                     enemy.kill()
@@ -248,7 +279,7 @@ class Game:
                 self.running = False
 
     def draw(self):
-        self.screen.fill(SKY_BLUE)
+        self.screen.blit(self.static_bg, (0, 0), pygame.Rect(self.scroll, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
         for sprite in self.all_sprites:
             self.screen.blit(sprite.image, (sprite.rect.x - self.scroll, sprite.rect.y))
         if self.flag_rect: